@@ -6,9 +6,15 @@ This module handles the complex mapping between:
 - Cubie model: corner/edge permutations and orientations
 """
 
+import logging
 import numpy as np
+from collections import namedtuple
+from functools import lru_cache
 from cube_state import CubeState
 from moves import MOVE_TABLE
+from pattern_databases import lehmer_encode, lehmer_decode, encode_corner_orient, decode_corner_orient
+
+logger = logging.getLogger(__name__)
 
 
 # Standard face colors
@@ -125,6 +131,13 @@ CORNER_REFERENCE_FACES = [
     D,  # Position 7 (DBL, picture vertex 7): reference should be on D
 ]
 
+# For each corner position, which facet (index into CORNER_DEFINITIONS[pos]) is on
+# the reference face, i.e. where the reference color sits at orientation 0
+EXPECTED_REF_IDX_CORNER = [
+    next(i for i, (face_idx, _, _) in enumerate(corner_def) if face_idx == CORNER_REFERENCE_FACES[pos])
+    for pos, corner_def in enumerate(CORNER_DEFINITIONS)
+]
+
 # Edge colors in solved state
 # Paper order: uf, ur, ub, ul, lf, fr, rb, bl, df, dr, db, dl
 # Order matches EDGE_DEFINITIONS: (face1_color, face2_color)
@@ -186,6 +199,13 @@ EDGE_POSITION_REFERENCE_FACES = [
     D,  # Position 11 (DL): reference should be on D
 ]
 
+# For each edge position, which facet (index into EDGE_DEFINITIONS[pos]) is on
+# the position's reference face
+EXPECTED_REF_IDX_EDGE = [
+    next(i for i, (face_idx, _, _) in enumerate(edge_def) if face_idx == EDGE_POSITION_REFERENCE_FACES[pos])
+    for pos, edge_def in enumerate(EDGE_DEFINITIONS)
+]
+
 # Reference color for each edge cubie (the color on the reference face in solved state)
 # Updated to match new reference face assignments
 # Paper order: uf, ur, ub, ul, lf, fr, rb, bl, df, dr, db, dl
@@ -205,364 +225,532 @@ EDGE_REFERENCE_COLORS = [
 ]
 
 
-def faces_to_cubie_state(faces):
+# Color letter -> color code (index into FACE_COLORS, as stored in face arrays)
+COLOR_CODES = {color: i for i, color in enumerate(FACE_COLORS)}
+
+# Integer color-code versions of the solved/reference color tables above
+SOLVED_CORNER_COLOR_CODES = np.array(
+    [[COLOR_CODES[c] for c in colors] for colors in SOLVED_CORNER_COLORS], dtype=np.int8)
+SOLVED_EDGE_COLOR_CODES = np.array(
+    [[COLOR_CODES[c] for c in colors] for colors in SOLVED_EDGE_COLORS], dtype=np.int8)
+CORNER_REFERENCE_COLOR_CODES = np.array([COLOR_CODES[c] for c in CORNER_REFERENCE_COLORS], dtype=np.int8)
+EDGE_REFERENCE_COLOR_CODES = np.array([COLOR_CODES[c] for c in EDGE_REFERENCE_COLORS], dtype=np.int8)
+
+
+def _corner_facelet_colors(pos, cubie, orient):
+    """
+    Colors shown at corner position `pos` when it holds `cubie` with orientation `orient`.
+    
+    Returns:
+        list of 3 color codes, in the facelet order of CORNER_DEFINITIONS[pos]
+    """
+    solved_colors = SOLVED_CORNER_COLOR_CODES[cubie].tolist()
+    
+    # Orientation system: the plus sign moves with the cubie
+    # Orientation 0: reference facet (plus sign) is where it should be (on U or D face at this position)
+    # Orientation 1: reference facet rotated clockwise from where it should be
+    # Orientation 2: reference facet rotated counterclockwise from where it should be
+    
+    # Which facet of this position is on its reference face (U or D)
+    ref_face_idx = EXPECTED_REF_IDX_CORNER[pos]
+    
+    # Find where the reference color (the plus sign color) is in solved_colors
+    ref_color_idx = solved_colors.index(CORNER_REFERENCE_COLOR_CODES[cubie])
+    
+    # The orientation tells us how much the cubie has rotated from where it should be
+    # orient=0: reference should be at ref_face_idx (correct orientation)
+    # orient=1: cubie rotated CW, so reference is now at (ref_face_idx + 1) % 3
+    # orient=2: cubie rotated CCW, so reference is now at (ref_face_idx + 2) % 3
+    # So the reference color is currently at position (ref_face_idx + orient) % 3 in corner_def
+    
+    # We need to rotate solved_colors so that:
+    # The reference color (at ref_color_idx in solved_colors) ends up at position (ref_face_idx + orient) % 3
+    target_ref_idx = (ref_face_idx + orient) % 3
+    
+    # Calculate rotation needed: we want ref_color_idx to end up at target_ref_idx
+    # If ref_color_idx is at position i, and we want it at position j,
+    # we need to rotate by (j - i) mod 3
+    rotation = (target_ref_idx - ref_color_idx) % 3
+    
+    # Rotate colors
+    return solved_colors[rotation:] + solved_colors[:rotation]
+
+
+def _edge_facelet_colors(pos, cubie, orient):
+    """
+    Colors shown at edge position `pos` when it holds `cubie` with orientation `orient`.
+    
+    Returns:
+        list of 2 color codes, in the facelet order of EDGE_DEFINITIONS[pos]
+    """
+    solved_colors = SOLVED_EDGE_COLOR_CODES[cubie].tolist()
+    
+    # Algorithm:
+    # 1. Place the edge cubie at its position (as edge_perm shows)
+    # 2. Put the color that has the + sign (reference color) on the face where the position initially has the + sign
+    # 3. If orient == 1, then reverse/flip the colors
+    
+    # Find which index in solved_colors has the reference color (the color with the + sign)
+    ref_color_idx = solved_colors.index(EDGE_REFERENCE_COLOR_CODES[cubie])
+    
+    # Which facet of this position is on its reference face (where the + sign should be initially)
+    pos_ref_idx = EXPECTED_REF_IDX_EDGE[pos]
+    
+    # Step 1 & 2: Place reference color at position's reference face
+    colors = [None, None]
+    colors[pos_ref_idx] = solved_colors[ref_color_idx]
+    colors[1 - pos_ref_idx] = solved_colors[1 - ref_color_idx]
+    
+    # Step 3: If orient == 1, reverse the colors
+    if orient == 1:
+        colors = colors[::-1]
+    
+    return colors
+
+
+# Colors shown at each position for every cubie and orientation, in the facelet
+# order of the position's definition:
+# CORNER_FACELET_COLORS[pos, cubie_idx, orientation] -> 3 color codes, shape (8, 8, 3, 3)
+# EDGE_FACELET_COLORS[pos, cubie_idx, orientation] -> 2 color codes, shape (12, 12, 2, 2)
+CORNER_FACELET_COLORS = np.array(
+    [[[_corner_facelet_colors(pos, cubie_idx, orientation) for orientation in range(3)]
+      for cubie_idx in range(8)]
+     for pos in range(8)],
+    dtype=np.int8)
+EDGE_FACELET_COLORS = np.array(
+    [[[_edge_facelet_colors(pos, cubie_idx, orientation) for orientation in range(2)]
+      for cubie_idx in range(12)]
+     for pos in range(12)],
+    dtype=np.int8)
+
+
+def _build_corner_lut():
+    """Invert corner placement: CORNER_LUT[pos, c0, c1, c2] -> (cubie_idx, orientation), -1 if no match."""
+    lut = np.full((8, 6, 6, 6, 2), -1, dtype=np.int8)
+    for pos, per_cubie in enumerate(CORNER_FACELET_COLORS.tolist()):
+        for cubie_idx, per_orientation in enumerate(per_cubie):
+            for orientation, (c0, c1, c2) in enumerate(per_orientation):
+                lut[pos, c0, c1, c2] = (cubie_idx, orientation)
+    return lut
+
+
+def _build_edge_lut():
+    """Invert edge placement: EDGE_LUT[pos, c0, c1] -> (cubie_idx, orientation), -1 if no match."""
+    lut = np.full((12, 6, 6, 2), -1, dtype=np.int8)
+    for pos, per_cubie in enumerate(EDGE_FACELET_COLORS.tolist()):
+        for cubie_idx, per_orientation in enumerate(per_cubie):
+            for orientation, (c0, c1) in enumerate(per_orientation):
+                lut[pos, c0, c1] = (cubie_idx, orientation)
+    return lut
+
+
+# Flat facelet index (face * 9 + row * 3 + col, into faces.reshape(54)) of every
+# corner/edge position, shaped (8, 3) and (12, 2), so all facelets of a cube can be
+# gathered/scattered with one single-array indexing call
+CORNER_FACELET_IDX = np.array([[f * 9 + r * 3 + c for f, r, c in d] for d in CORNER_DEFINITIONS])
+EDGE_FACELET_IDX = np.array([[f * 9 + r * 3 + c for f, r, c in d] for d in EDGE_DEFINITIONS])
+
+# Dense tables indexed by the raw facelet colors in definition order,
+# CORNER_LUT[pos, c0, c1, c2] / EDGE_LUT[pos, c0, c1] -> (cubie_idx, orientation).
+# Built once at import by inverting the placement used in cubie_state_to_faces,
+# so the two conversions are exact inverses of each other.
+CORNER_LUT = _build_corner_lut()
+EDGE_LUT = _build_edge_lut()
+
+# Center facelet colors, U=W(0), L=O(3), F=G(5), R=R(2), B=B(4), D=Y(1)
+_CENTERS = np.array([0, 3, 5, 2, 4, 1], dtype=np.int8)  # U, L, F, R, B, D
+
+# The same tables split into flat cubie and orientation columns indexed by
+# pos * keys + base-6 key (key = c0*36 + c1*6 + c2 for corners, c0*6 + c1 for edges),
+# so every lookup writes one contiguous int8 array per state component
+CORNER_PERM_LUT = np.ascontiguousarray(CORNER_LUT[..., 0].reshape(-1))
+CORNER_ORIENT_LUT = np.ascontiguousarray(CORNER_LUT[..., 1].reshape(-1))
+EDGE_PERM_LUT = np.ascontiguousarray(EDGE_LUT[..., 0].reshape(-1))
+EDGE_ORIENT_LUT = np.ascontiguousarray(EDGE_LUT[..., 1].reshape(-1))
+CORNER_KEY_BASE = np.arange(8) * 216
+EDGE_KEY_BASE = np.arange(12) * 36
+# Base-6 key weights; a matmul with these widens int8 colors before they can overflow
+CORNER_KEY_WEIGHTS = np.array([36, 6, 1])
+EDGE_KEY_WEIGHTS = np.array([6, 1])
+
+# The tables above are shared module state: make them read-only (all are C-contiguous)
+for _table in (SOLVED_CORNER_COLOR_CODES, SOLVED_EDGE_COLOR_CODES,
+               CORNER_REFERENCE_COLOR_CODES, EDGE_REFERENCE_COLOR_CODES,
+               CORNER_FACELET_COLORS, EDGE_FACELET_COLORS, CORNER_FACELET_IDX, EDGE_FACELET_IDX,
+               CORNER_LUT, EDGE_LUT, _CENTERS, CORNER_PERM_LUT, CORNER_ORIENT_LUT,
+               EDGE_PERM_LUT, EDGE_ORIENT_LUT, CORNER_KEY_BASE, EDGE_KEY_BASE,
+               CORNER_KEY_WEIGHTS, EDGE_KEY_WEIGHTS):
+    assert _table.flags.c_contiguous
+    _table.flags.writeable = False
+del _table
+
+
+def _lookup_cubies(flat):
+    """
+    Pure integer kernel behind the batch converter (and the reference for the
+    unrolled single-cube version below).
+    
+    Args:
+        flat: integer array of shape (..., 54), faces flattened as face * 9 + row * 3 + col
+    
+    Returns:
+        (corner_perm, corner_orient, edge_perm, edge_orient) contiguous int8 arrays of
+        shapes (..., 8), (..., 8), (..., 12), (..., 12); -1 where no cubie matches
+    """
+    corner_keys = CORNER_KEY_BASE + flat.take(CORNER_FACELET_IDX, axis=-1) @ CORNER_KEY_WEIGHTS
+    edge_keys = EDGE_KEY_BASE + flat.take(EDGE_FACELET_IDX, axis=-1) @ EDGE_KEY_WEIGHTS
+    return (CORNER_PERM_LUT[corner_keys], CORNER_ORIENT_LUT[corner_keys],
+            EDGE_PERM_LUT[edge_keys], EDGE_ORIENT_LUT[edge_keys])
+
+
+def _build_unrolled_lookup():
+    """
+    Generate _lookup_cubies specialized to one cube, as straight-line Python.
+    
+    The 20 facelet reads and LUT lookups are emitted with every index folded to a
+    literal, so a single conversion runs no loops and no NumPy calls.
+    
+    Returns:
+        function(flat_list) -> (corner_perm, corner_orient, edge_perm, edge_orient) lists,
+        where flat_list is faces.reshape(54).tolist(); -1 where no cubie matches
+    """
+    lines = ['def _lookup_cubies_unrolled(f):']
+    for pos, (i0, i1, i2) in enumerate(CORNER_FACELET_IDX.tolist()):
+        lines.append(f'    c{pos} = f[{i0}] * 36 + f[{i1}] * 6 + f[{i2}] + {pos * 216}')
+    for pos, (i0, i1) in enumerate(EDGE_FACELET_IDX.tolist()):
+        lines.append(f'    e{pos} = f[{i0}] * 6 + f[{i1}] + {pos * 36}')
+    lines.append('    return (')
+    for table, key, n in (('CP', 'c', 8), ('CO', 'c', 8), ('EP', 'e', 12), ('EO', 'e', 12)):
+        lines.append('        [' + ', '.join(f'{table}[{key}{i}]' for i in range(n)) + '],')
+    lines.append('    )')
+    
+    namespace = {'CP': CORNER_PERM_LUT.tolist(), 'CO': CORNER_ORIENT_LUT.tolist(),
+                 'EP': EDGE_PERM_LUT.tolist(), 'EO': EDGE_ORIENT_LUT.tolist()}
+    exec('\n'.join(lines), namespace)
+    return namespace['_lookup_cubies_unrolled']
+
+
+_lookup_cubies_unrolled = _build_unrolled_lookup()
+_CENTER_LIST = _CENTERS.tolist()
+
+# Position names for failure messages (corners match the picture-vertex labeling;
+# edges follow paper order: uf, ur, ub, ul, lf, fr, rb, bl, df, dr, db, dl)
+CORNER_NAMES = ['DFR', 'DRB', 'URF', 'UBR', 'UFL', 'ULB', 'DLF', 'DBL']
+EDGE_NAMES = ['UF', 'UR', 'UB', 'UL', 'FL', 'FR', 'BR', 'BL', 'DF', 'DR', 'DB', 'DL']
+
+
+def faces_to_cubie_state(faces, validate: bool = False):
     """
     Convert 6x3x3 face array to cubie model state.
     
     Args:
         faces: numpy array of shape (6, 3, 3) where faces[face_idx][row][col] = color_code
+               (any numeric dtype; converted once to uint8, which is not copied)
+        validate: also reject faces that are not a solvable cube (wrong centers,
+                  a cubie appearing twice, or twist/flip/parity invariants broken)
     
     Returns:
         CubeState object, or None if conversion fails
     """
-    # Initialize arrays
-    corner_perm = np.zeros(8, dtype=np.int32)
-    corner_orient = np.zeros(8, dtype=np.int32)
-    edge_perm = np.zeros(12, dtype=np.int32)
-    edge_orient = np.zeros(12, dtype=np.int32)
-    
-    # Convert color codes to letters
-    color_map = {i: FACE_COLORS[i] for i in range(6)}
-    
-    # Find corners
-    for corner_pos in range(8):
-        corner_def = CORNER_DEFINITIONS[corner_pos]
-        colors = []
-        face_indices = []
-        
-        for face_idx, row, col in corner_def:
-            color_code = int(faces[face_idx, row, col])
-            color = color_map[color_code]
-            colors.append(color)
-            face_indices.append(face_idx)
-        
-        # Find which cubie this is
-        cubie_idx, orientation = find_corner_cubie(colors, face_indices, corner_pos)
-        if cubie_idx is None:
-            # Debug: print which corner failed (order matches new corner position labeling)
-            corner_names = ['DFR', 'DRB', 'URF', 'UBR', 'UFL', 'ULB', 'DLF', 'DBL']
-            print(f"Failed to match corner {corner_names[corner_pos]} with colors {colors}")
-            return None  # Invalid state
-        
-        corner_perm[corner_pos] = cubie_idx
-        corner_orient[corner_pos] = orientation
-    
-    # Find edges
-    for edge_pos in range(12):
-        edge_def = EDGE_DEFINITIONS[edge_pos]
-        colors = []
-        face_indices = []
-        
-        for face_idx, row, col in edge_def:
-            color_code = int(faces[face_idx, row, col])
-            color = color_map[color_code]
-            colors.append(color)
-            face_indices.append(face_idx)
-        
-        # Find which cubie this is
-        cubie_idx, orientation = find_edge_cubie(colors, face_indices, edge_pos)
-        if cubie_idx is None:
-            # Debug: print which edge failed
-            # Paper order: uf, ur, ub, ul, lf, fr, rb, bl, df, dr, db, dl
-            edge_names = ['UF', 'UR', 'UB', 'UL', 'FL', 'FR', 'BR', 'BL', 'DF', 'DR', 'DB', 'DL']
-            print(f"Failed to match edge {edge_names[edge_pos]} with colors {colors}")
-            return None  # Invalid state
-        
-        edge_perm[edge_pos] = cubie_idx
-        edge_orient[edge_pos] = orientation
-    
-    return CubeState(corner_perm, corner_orient, edge_perm, edge_orient)
+    # Convert straight into the new state's buffer (the component slices are views)
+    state = CubeState()
+    data = state._data
+    if not faces_to_cubie_state_into(faces, data[0:8], data[8:16], data[16:28], data[28:40], validate):
+        return None
+    return state
 
 
-def find_corner_cubie(colors, face_indices, corner_pos):
+def faces_to_cubie_state_into(faces, out_corner_perm, out_corner_orient, out_edge_perm, out_edge_orient,
+                               validate: bool = False) -> bool:
     """
-    Find which corner cubie matches the given colors and calculate orientation.
+    Convert a 6x3x3 face array into caller-provided buffers instead of a new CubeState.
+    
+    The outputs can be lists or array views, e.g. rows of preallocated (N, 8) / (N, 12)
+    int8 arrays, so a solver can fill one large buffer without per-state objects.
+    See faces_to_cubie_state() for faces and validate.
+    
+    Returns:
+        True if the buffers were filled, False if conversion fails (buffers untouched)
+    """
+    # One conversion at the boundary (no copy for uint8 input) so any numeric array works
+    flat = np.asarray(faces, dtype=np.uint8).reshape(54).tolist()
+    
+    # Find which cubie sits at every position (and how it is twisted/flipped)
+    corner_perm, corner_orient, edge_perm, edge_orient = _lookup_cubies_unrolled(flat)
     
-    Uses paper's '+' marker system: orientation is based on which face the reference
-    facet (marked with +) is on. Reference facet should be on U or D face.
+    if -1 in corner_perm:
+        if logger.isEnabledFor(logging.DEBUG):
+            # Report which corner failed (order matches new corner position labeling)
+            corner_pos = corner_perm.index(-1)
+            colors = [FACE_COLORS[flat[i]] for i in CORNER_FACELET_IDX[corner_pos]]
+            logger.debug("Failed to match corner %s with colors %s", CORNER_NAMES[corner_pos], colors)
+        return False  # Invalid state
+    
+    if -1 in edge_perm:
+        if logger.isEnabledFor(logging.DEBUG):
+            # Report which edge failed
+            edge_pos = edge_perm.index(-1)
+            colors = [FACE_COLORS[flat[i]] for i in EDGE_FACELET_IDX[edge_pos]]
+            logger.debug("Failed to match edge %s with colors %s", EDGE_NAMES[edge_pos], colors)
+        return False  # Invalid state
+    
+    if validate:
+        if flat[4::9] != _CENTER_LIST:
+            logger.debug("Invalid cube: centers are not U=W, L=O, F=G, R=R, B=B, D=Y")
+            return False
+        # Every position matched some cubie; with each cubie used exactly once the
+        # color counts are 9 each as well
+        if len(set(corner_perm)) != 8 or len(set(edge_perm)) != 12:
+            logger.debug("Invalid cube: a cubie appears more than once")
+            return False
+        # Same invariants as CubeState.is_valid(), checked on the lists before writing
+        if (CubeState._permutation_parity(corner_perm) != CubeState._permutation_parity(edge_perm)
+                or sum(corner_orient) % 3 or sum(edge_orient) % 2):
+            logger.debug("Invalid cube: twist, flip or permutation parity is not solvable")
+            return False
+    
+    out_corner_perm[:] = corner_perm
+    out_corner_orient[:] = corner_orient
+    out_edge_perm[:] = edge_perm
+    out_edge_orient[:] = edge_orient
+    return True
+
+
+def faces_batch_to_cubie_states(faces_batch):
+    """
+    Convert N face arrays to cubie coordinates without a Python loop over cubes.
     
     Args:
-        colors: list of 3 color letters (in order of face_indices)
-        face_indices: list of 3 face indices where colors appear (U/L/F/R/B/D)
-        corner_pos: the corner position (0-7) we're looking at
+        faces_batch: numpy array of shape (N, 6, 3, 3) of color codes (int8 or uint8;
+                     any integer dtype is used as-is, without a copy)
     
     Returns:
-        (cubie_index, orientation) or (None, None) if not found
+        (corner_perm, corner_orient, edge_perm, edge_orient) int8 arrays of shapes
+        (N, 8), (N, 8), (N, 12), (N, 12), one contiguous array per component
+        (structure of arrays over the batch). Positions that match no cubie hold -1,
+        so invalid cubes are rows where (corner_perm < 0).any() or (edge_perm < 0).any().
     """
-    # Try each cubie
-    for cubie_idx in range(8):
-        solved_colors = SOLVED_CORNER_COLORS[cubie_idx]
-        
-        # Check if colors match (as a set, order doesn't matter for matching)
-        if set(colors) != set(solved_colors):
-            continue
+    faces_batch = np.asarray(faces_batch)
+    if faces_batch.dtype.kind not in 'iu':
+        faces_batch = faces_batch.astype(np.int8)
+    return _lookup_cubies(faces_batch.reshape(-1, 54))
+
+
+# The color-matching finders below are what the LUTs replaced. They are not needed at
+# runtime; set _VERIFY = True to define them and check them against the LUTs at import.
+_VERIFY = False
+
+if _VERIFY:
+    # One bit per color (1 << code): a cubie's color set is the OR of its facelet bits.
+    # Every cubie has distinct colors, so comparing masks is the same as comparing sets.
+    # Colors are int codes here, as in the face arrays, so masks and compares are int ops.
+    SOLVED_CORNER_CODES = SOLVED_CORNER_COLOR_CODES.tolist()
+    SOLVED_EDGE_CODES = SOLVED_EDGE_COLOR_CODES.tolist()
+    CORNER_REFERENCE_CODES = CORNER_REFERENCE_COLOR_CODES.tolist()
+    SOLVED_CORNER_MASKS = [(1 << c0) | (1 << c1) | (1 << c2) for c0, c1, c2 in SOLVED_CORNER_CODES]
+    SOLVED_EDGE_MASKS = [(1 << c0) | (1 << c1) for c0, c1 in SOLVED_EDGE_CODES]
+    
+    # Masks are unique per cubie, so invert them: 6-bit mask -> cubie index, -1 if none
+    CORNER_BY_MASK = [-1] * 64
+    EDGE_BY_MASK = [-1] * 64
+    for _cubie_idx, _mask in enumerate(SOLVED_CORNER_MASKS):
+        CORNER_BY_MASK[_mask] = _cubie_idx
+    for _cubie_idx, _mask in enumerate(SOLVED_EDGE_MASKS):
+        EDGE_BY_MASK[_mask] = _cubie_idx
+
+    # Solved corner colors rotated left by each orientation, packed c0 | c1 << 8 | c2 << 16,
+    # so checking a rotation is a single int compare
+    SOLVED_CORNER_ROT_KEYS = [
+        [colors[o] | colors[(o + 1) % 3] << 8 | colors[(o + 2) % 3] << 16 for o in range(3)]
+        for colors in SOLVED_CORNER_CODES
+    ]
+
+    def find_corner_cubie(colors, face_indices, corner_pos):
+        """
+        Find which corner cubie matches the given colors and calculate orientation.
+        
+        Uses paper's '+' marker system: orientation is based on which face the reference
+        facet (marked with +) is on. Reference facet should be on U or D face.
+        
+        Args:
+            colors: list of 3 color codes (in order of CORNER_DEFINITIONS[corner_pos])
+            face_indices: list of 3 face indices where colors appear (U/L/F/R/B/D);
+                          unused, the facet order is fixed by corner_pos
+            corner_pos: the corner position (0-7) we're looking at
+        
+        Returns:
+            (cubie_index, orientation) or (None, None) if not found
+        """
+        # The color set (as order doesn't matter for matching) picks the cubie directly
+        cubie_idx = CORNER_BY_MASK[(1 << colors[0]) | (1 << colors[1]) | (1 << colors[2])]
+        if cubie_idx < 0:
+            return None, None
         
         # Find the reference color for this cubie (the color on U or D in solved state)
-        reference_color = CORNER_REFERENCE_COLORS[cubie_idx]
-        
-        # Find which face the reference color is currently on
-        reference_color_idx = None
-        for i, color in enumerate(colors):
-            if color == reference_color:
-                reference_color_idx = i
-                break
-        
-        if reference_color_idx is None:
-            continue  # Shouldn't happen if colors match
-        
-        # Get the face index where the reference color currently appears
-        reference_face_current = face_indices[reference_color_idx]
-        
-        # The reference facet should be on U or D face for orientation 0
-        # For this position, what face should have the reference facet?
-        expected_reference_face = CORNER_REFERENCE_FACES[corner_pos]
-        
-        # Find which index in face_indices has the expected reference face (U or D)
-        expected_ref_idx = None
-        for i, face_idx in enumerate(face_indices):
-            if face_idx == expected_reference_face:
-                expected_ref_idx = i
-                break
-        
-        if expected_ref_idx is None:
-            continue  # Shouldn't happen - every corner position has U or D face
-        
-        # Find which index currently has the reference color
-        ref_color_idx = None
-        for i, color in enumerate(colors):
-            if color == reference_color:
-                ref_color_idx = i
-                break
-        
-        if ref_color_idx is None:
-            continue  # Shouldn't happen if colors match
+        # and which facet it is currently on
+        ref_color_idx = colors.index(CORNER_REFERENCE_CODES[cubie_idx])
         
         # Calculate orientation: how many positions is reference from where it should be?
-        # If reference is at expected_ref_idx, orientation is 0
-        # If reference is at (expected_ref_idx + 1) % 3, orientation is 1 (CW)
-        # If reference is at (expected_ref_idx + 2) % 3, orientation is 2 (CCW)
-        orientation = (ref_color_idx - expected_ref_idx) % 3
-        
-        # Verify this orientation produces correct color arrangement
-        # Rotate colors by inverse orientation to check if they match solved state
-        inv_orientation = (3 - orientation) % 3
-        rotated_colors_check = colors[inv_orientation:] + colors[:inv_orientation]
-        
-        if rotated_colors_check == solved_colors:
+        # If reference is at the expected (U/D) facet, orientation is 0
+        # If reference is one facet before it (in definition order), orientation is 1 (CW)
+        # If reference is two facets before it, orientation is 2 (CCW)
+        # (this matches the placement used by cubie_state_to_faces and the move tables)
+        orientation = (EXPECTED_REF_IDX_CORNER[corner_pos] - ref_color_idx) % 3
+        
+        # Only a rotation of the solved colors is physically possible (mirrored sticker
+        # order is not); at orientation o the facets show solved_colors rotated by o
+        if colors[0] | colors[1] << 8 | colors[2] << 16 == SOLVED_CORNER_ROT_KEYS[cubie_idx][orientation]:
             return cubie_idx, orientation
-        
-        # If no orientation worked, try matching by color order (fallback)
-        for orient in range(3):
-            rotated = colors[orient:] + colors[:orient]
-            if rotated == solved_colors:
-                return cubie_idx, orient
-    
-    return None, None
+        return None, None
+
+    def find_edge_cubie(colors, face_indices, edge_pos):
+        """
+        Find which edge cubie matches the given colors and calculate orientation.
+        
+        Uses paper's '+' marker system: orientation is based on which face the reference
+        facet (marked with +) is on. Reference facet should be on a specific face.
+        
+        Args:
+            colors: list of 2 color codes (in order of EDGE_DEFINITIONS[edge_pos])
+            face_indices: list of 2 face indices where colors appear (U/L/F/R/B/D);
+                          unused, the facet order is fixed by edge_pos
+            edge_pos: the edge position (0-11) we're looking at
+        
+        Returns:
+            (cubie_index, orientation) or (None, None) if not found
+        """
+        # The color set (as order doesn't matter for matching) picks the cubie directly
+        cubie_idx = EDGE_BY_MASK[(1 << colors[0]) | (1 << colors[1])]
+        if cubie_idx < 0:
+            return None, None
+        
+        # Same two colors, so they are either in solved order (orientation 0) or
+        # swapped (orientation 1); the color order alone decides, no reference search
+        return cubie_idx, (0 if colors[0] == SOLVED_EDGE_CODES[cubie_idx][0] else 1)
+
+
+    def _verify_tables():
+        """Check every possible facelet color tuple: finders and LUTs must agree."""
+        for pos, definition in enumerate(CORNER_DEFINITIONS):
+            face_indices = [f for f, _, _ in definition]
+            for c0 in range(6):
+                for c1 in range(6):
+                    for c2 in range(6):
+                        colors = [c0, c1, c2]
+                        cubie_idx, orientation = CORNER_LUT[pos, c0, c1, c2].tolist()
+                        expected = (None, None) if cubie_idx < 0 else (cubie_idx, orientation)
+                        assert find_corner_cubie(colors, face_indices, pos) == expected, (pos, colors)
+        for pos, definition in enumerate(EDGE_DEFINITIONS):
+            face_indices = [f for f, _, _ in definition]
+            for c0 in range(6):
+                for c1 in range(6):
+                    colors = [c0, c1]
+                    cubie_idx, orientation = EDGE_LUT[pos, c0, c1].tolist()
+                    expected = (None, None) if cubie_idx < 0 else (cubie_idx, orientation)
+                    assert find_edge_cubie(colors, face_indices, pos) == expected, (pos, colors)
+
+    _verify_tables()
 
 
-def find_edge_cubie(colors, face_indices, edge_pos):
+# Whole-cube coordinate: two ints instead of four lists, hashable and compared in one op.
+#   corner = lehmer(corner_perm) * 3^7 + corner orientation (7 base-3 digits)  < 2^27
+#   edge   = lehmer(edge_perm) * 2^11 + edge orientation (11 bits)             < 2^40
+# The last orientation digit of each is implied by the sum constraint, so it is dropped.
+CubeCoord = namedtuple('CubeCoord', 'corner edge')
+
+
+def state_to_coord(state: CubeState) -> CubeCoord:
+    """Rank a cubie state into a CubeCoord."""
+    # Plain ints: uint8 elements would overflow in the ranking arithmetic
+    edge_orient = state.edge_orient.tolist()
+    edge_orient_index = 0
+    for i in range(10, -1, -1):
+        edge_orient_index = (edge_orient_index << 1) | edge_orient[i]
+    return CubeCoord(
+        lehmer_encode(state.corner_perm.tolist()) * 2187 + encode_corner_orient(state.corner_orient.tolist()),
+        (lehmer_encode(state.edge_perm.tolist()) << 11) | edge_orient_index,
+    )
+
+
+def coord_to_state(coord: CubeCoord) -> CubeState:
+    """Unrank a CubeCoord back into a cubie state (inverse of state_to_coord)."""
+    corner_perm_index, corner_orient_index = divmod(coord.corner, 2187)
+    edge_orient = [(coord.edge >> i) & 1 for i in range(11)]
+    edge_orient.append(sum(edge_orient) % 2)
+    return CubeState(lehmer_decode(8, corner_perm_index), decode_corner_orient(corner_orient_index),
+                     lehmer_decode(12, coord.edge >> 11), edge_orient)
+
+
+def faces_to_coord(faces):
+    """Convert a 6x3x3 face array straight to a CubeCoord, or None if conversion fails."""
+    state = faces_to_cubie_state(faces)
+    return None if state is None else state_to_coord(state)
+
+
+def cubie_state_to_faces(state: CubeState, out=None):
     """
-    Find which edge cubie matches the given colors and calculate orientation.
+    Convert cubie model state to 6x3x3 face array.
     
-    Uses paper's '+' marker system: orientation is based on which face the reference
-    facet (marked with +) is on. Reference facet should be on a specific face.
+    Results are cached by packed state, so repeated states (e.g. redraws) are free.
     
     Args:
-        colors: list of 2 color letters (in order of face_indices)
-        face_indices: list of 2 face indices where colors appear (U/L/F/R/B/D)
-        edge_pos: the edge position (0-11) we're looking at
+        state: CubeState object, a CubeCoord, or a (corners, edges) tuple from CubeState.pack()
+        out: optional (6, 3, 3) array to write into instead of allocating a new one
     
     Returns:
-        (cubie_index, orientation) or (None, None) if not found
+        numpy int8 array of shape (6, 3, 3) with color codes (out, if given)
     """
-    # Try each edge cubie
-    for cubie_idx in range(12):
-        solved_colors = SOLVED_EDGE_COLORS[cubie_idx]
-        
-        # Check if colors match (as a set, order doesn't matter for matching)
-        if set(colors) != set(solved_colors):
-            continue
-        
-        # Find the reference color for this cubie (the color on the reference face)
-        reference_color = EDGE_REFERENCE_COLORS[cubie_idx]
-        
-        # Find which face the reference color is currently on
-        ref_color_idx = None
-        for i, color in enumerate(colors):
-            if color == reference_color:
-                ref_color_idx = i
-                break
-        
-        if ref_color_idx is None:
-            continue  # Shouldn't happen if colors match
-        
-        # Get the face index where the reference color currently appears
-        reference_face_current = face_indices[ref_color_idx]
-        
-        # The reference facet should be on a specific face for this position
-        expected_reference_face = EDGE_POSITION_REFERENCE_FACES[edge_pos]
-        
-        # Calculate orientation: 0 if reference is on expected face, 1 if flipped
-        if reference_face_current == expected_reference_face:
-            orientation = 0
-        else:
-            orientation = 1
-        
-        # Verify this orientation produces correct color arrangement
-        # The orientation we calculated should be correct, but verify by checking colors
-        # If orientation is 0, colors should match solved_colors
-        # If orientation is 1, colors should match solved_colors reversed
-        if orientation == 0:
-            if colors == solved_colors:
-                return cubie_idx, orientation
-            # If colors are reversed, orientation should be 1
-            elif colors == solved_colors[::-1]:
-                return cubie_idx, 1
-        else:  # orientation == 1
-            if colors == solved_colors[::-1]:
-                return cubie_idx, orientation
-            # If colors match solved, orientation should be 0
-            elif colors == solved_colors:
-                return cubie_idx, 0
-    
-    return None, None
-
-
-def cubie_state_to_faces(state: CubeState):
+    if isinstance(state, CubeCoord):
+        state = coord_to_state(state)
+    elif not isinstance(state, CubeState):
+        state = CubeState.unpack(state)
+    faces = _cached_faces(state.to_bytes())
+    if out is None:
+        return faces.copy()
+    out[...] = faces
+    return out
+
+
+def _build_unrolled_placement():
     """
-    Convert cubie model state to 6x3x3 face array.
+    Generate the cubie -> facelet placement as straight-line Python.
     
-    Args:
-        state: CubeState object
+    Every facelet of the 54-byte face buffer is one literal expression: a center
+    constant, or one slot of the color tuple that the cubie at that position shows,
+    looked up straight from the CubeState.to_bytes() key.
     
     Returns:
-        numpy array of shape (6, 3, 3) with color codes
+        function(key) -> 54 bytes of color codes (faces.reshape(54) order)
     """
-    faces = np.zeros((6, 3, 3), dtype=int)
-    
-    # We need to map cubies back to face positions
-    # This requires applying the inverse permutation
+    facelets = [None] * 54
+    for face_idx, color in enumerate(_CENTERS.tolist()):
+        facelets[face_idx * 9 + 4] = str(color)
+    for pos, slots in enumerate(CORNER_FACELET_IDX.tolist()):
+        for slot, i in enumerate(slots):
+            facelets[i] = f'c{pos}[{slot}]'
+    for pos, slots in enumerate(EDGE_FACELET_IDX.tolist()):
+        for slot, i in enumerate(slots):
+            facelets[i] = f'e{pos}[{slot}]'
     
-    # For corners
+    # CF[(pos * 8 + cubie) * 3 + orient] / EF[(pos * 12 + cubie) * 2 + orient] -> color tuple
+    lines = ['def _place_cubies_unrolled(k):']
     for pos in range(8):
-        cubie = state.corner_perm[pos]
-        orient = state.corner_orient[pos]
-        corner_def = CORNER_DEFINITIONS[pos]
-        solved_colors = SOLVED_CORNER_COLORS[cubie]
-        
-        # Orientation system: the plus sign moves with the cubie
-        # Orientation 0: reference facet (plus sign) is where it should be (on U or D face at this position)
-        # Orientation 1: reference facet rotated clockwise from where it should be
-        # Orientation 2: reference facet rotated counterclockwise from where it should be
-        
-        # Get the reference color for this cubie (the plus sign color)
-        reference_color = CORNER_REFERENCE_COLORS[cubie]
-        
-        # Expected face for reference facet at this position (U or D)
-        expected_ref_face = CORNER_REFERENCE_FACES[pos]
-        
-        # Find which position in corner_def has the expected reference face
-        ref_face_idx = None
-        for i, (face_idx, row, col) in enumerate(corner_def):
-            if face_idx == expected_ref_face:
-                ref_face_idx = i
-                break
-        
-        if ref_face_idx is None:
-            # Shouldn't happen - every corner position has U or D face
-            ref_face_idx = 0
-        
-        # Find where the reference color is in solved_colors
-        ref_color_idx = None
-        for i, color in enumerate(solved_colors):
-            if color == reference_color:
-                ref_color_idx = i
-                break
-        
-        if ref_color_idx is None:
-            # Shouldn't happen
-            ref_color_idx = 0
-        
-        # The orientation tells us how much the cubie has rotated from where it should be
-        # orient=0: reference should be at ref_face_idx (correct orientation)
-        # orient=1: cubie rotated CW, so reference is now at (ref_face_idx + 1) % 3
-        # orient=2: cubie rotated CCW, so reference is now at (ref_face_idx + 2) % 3
-        # So the reference color is currently at position (ref_face_idx + orient) % 3 in corner_def
-        
-        # We need to rotate solved_colors so that:
-        # The reference color (at ref_color_idx in solved_colors) ends up at position (ref_face_idx + orient) % 3
-        target_ref_idx = (ref_face_idx + orient) % 3
-        
-        # Calculate rotation needed: we want ref_color_idx to end up at target_ref_idx
-        # If ref_color_idx is at position i, and we want it at position j,
-        # we need to rotate by (j - i) mod 3
-        rotation = (target_ref_idx - ref_color_idx) % 3
-        
-        # Rotate colors
-        rotated_colors = solved_colors[rotation:] + solved_colors[:rotation]
-        
-        # Place colors on faces
-        for i, (face_idx, row, col) in enumerate(corner_def):
-            color = rotated_colors[i]
-            color_code = FACE_COLORS.index(color)
-            faces[face_idx, row, col] = color_code
-    
-    # For edges
+        lines.append(f'    c{pos} = CF[k[{pos}] * 3 + k[{8 + pos}] + {pos * 24}]')
     for pos in range(12):
-        cubie = state.edge_perm[pos]
-        orient = state.edge_orient[pos]
-        edge_def = EDGE_DEFINITIONS[pos]
-        solved_colors = SOLVED_EDGE_COLORS[cubie]
-        
-        # Algorithm:
-        # 1. Place the edge cubie at its position (as edge_perm shows)
-        # 2. Put the color that has the + sign (reference color) on the face where the position initially has the + sign
-        # 3. If orient == 1, then reverse/flip the colors
-        
-        # Get the reference color for this cubie (the color with the + sign)
-        reference_color = EDGE_REFERENCE_COLORS[cubie]
-        
-        # Find which index in solved_colors has the reference color
-        ref_color_idx = None
-        for i, color in enumerate(solved_colors):
-            if color == reference_color:
-                ref_color_idx = i
-                break
-        if ref_color_idx is None:
-            ref_color_idx = 0
-        
-        # Get the position's reference face (where the + sign should be initially)
-        pos_ref_face = EDGE_POSITION_REFERENCE_FACES[pos]
-        
-        # Find which index in edge_def has the position's reference face
-        pos_ref_idx = None
-        for i, (face_idx, row, col) in enumerate(edge_def):
-            if face_idx == pos_ref_face:
-                pos_ref_idx = i
-                break
-        if pos_ref_idx is None:
-            pos_ref_idx = 0
-        
-        # Step 1 & 2: Place reference color at position's reference face
-        colors = [None, None]
-        colors[pos_ref_idx] = solved_colors[ref_color_idx]
-        colors[1 - pos_ref_idx] = solved_colors[1 - ref_color_idx]
-        
-        # Step 3: If orient == 1, reverse the colors
-        if orient == 1:
-            colors = colors[::-1]
-        
-        # Place colors on faces
-        for i, (face_idx, row, col) in enumerate(edge_def):
-            color = colors[i]
-            color_code = FACE_COLORS.index(color)
-            faces[face_idx, row, col] = color_code
+        lines.append(f'    e{pos} = EF[k[{16 + pos}] * 2 + k[{28 + pos}] + {pos * 24}]')
+    lines.append('    return bytes([' + ', '.join(facelets) + '])')
     
-    # Set center facelets (each face's center is always that face's color)
-    # U=W(0), L=O(3), F=G(5), R=R(2), B=B(4), D=Y(1)
-    center_colors = [0, 3, 5, 2, 4, 1]  # U, L, F, R, B, D
-    for face_idx in range(6):
-        faces[face_idx, 1, 1] = center_colors[face_idx]
-    
-    return faces
+    namespace = {'CF': [tuple(c) for c in CORNER_FACELET_COLORS.reshape(-1, 3).tolist()],
+                 'EF': [tuple(c) for c in EDGE_FACELET_COLORS.reshape(-1, 2).tolist()]}
+    exec('\n'.join(lines), namespace)
+    return namespace['_place_cubies_unrolled']
+
+
+_place_cubies_unrolled = _build_unrolled_placement()
+
 
+@lru_cache(maxsize=10000)
+def _cached_faces(key: bytes):
+    """Face array for a packed state key (read-only; callers get a copy)."""
+    # frombuffer over immutable bytes is already read-only
+    return np.frombuffer(_place_cubies_unrolled(key), dtype=np.int8).reshape(6, 3, 3)
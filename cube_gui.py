@@ -8,15 +8,16 @@ import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser
 import numpy as np
 from cube_state import CubeState, solved_state
-from moves import MOVE_TABLE, MOVE_NAMES
-from heuristics import Heuristic
-from search import IDAStar
+from cube_converter import cubie_state_to_faces, faces_to_cubie_state
+from moves import MOVE_TABLE
+from heuristics import Heuristic, get_heuristic
+from search import IDAStar, SearchTimeout
+from utils import apply_moves, compose_moves
 import threading
 import time
-import subprocess
-import sys
+import queue
 import os
-import re
+from collections import OrderedDict
 
 
 # Standard Rubik's Cube colors (RGB)
@@ -36,6 +37,19 @@ STANDARD_COLORS = {
 #     D
 FACE_NAMES = ['U', 'L', 'F', 'R', 'B', 'D']  # Up, Left, Front, Right, Back, Down
 
+# Face colors of the solved cube, built once and copied into visualizer buffers
+_SOLVED_FACES = cubie_state_to_faces(solved_state())
+_SOLVED_FACES.flags.writeable = False
+
+# Time between animated solution moves (milliseconds)
+ANIMATION_STEP_MS = 1500
+
+# Number of solved states remembered by CubeSolverGUI so repeated solves are instant
+SOLUTION_CACHE_SIZE = 128
+
+# Seconds a single IDA* solve may run before the GUI gives up on it
+SOLVE_TIME_LIMIT = 300
+
 
 class CubeVisualizer:
     """Visualizes a Rubik's cube in 2D net format."""
@@ -55,12 +69,11 @@ class CubeVisualizer:
         
         # Cube state as 6 faces, each 3x3
         # faces[face_index][row][col] = color_code
-        self.faces = np.zeros((6, 3, 3), dtype=int)
-        self._initialize_solved_state()
+        self.faces = _SOLVED_FACES.copy()
         
         # Color mapping: 0=W, 1=Y, 2=R, 3=O, 4=B, 5=G
         self.color_codes = ['W', 'Y', 'R', 'O', 'B', 'G']
-        self.color_values = [STANDARD_COLORS[c] for c in self.color_codes]
+        self.color_values = tuple(STANDARD_COLORS[c] for c in self.color_codes)
         
         # Face positions in net (row, col)
         self.face_positions = {
@@ -71,13 +84,26 @@ class CubeVisualizer:
             4: (1, 3),  # B (Back)
             5: (2, 1),  # D (Down)
         }
-    
-    def _initialize_solved_state(self):
-        """Initialize to solved state using the converter."""
-        from cube_state import solved_state
-        from cube_converter import cubie_state_to_faces
-        solved = solved_state()
-        self.faces = cubie_state_to_faces(solved)
+        
+        # Top-left corner of each face relative to the net offset (+20 for label space)
+        face_width = 3 * cell_size
+        self._face_origins = np.array([
+            (col_pos * (face_width + spacing) + spacing,
+             row_pos * (face_width + spacing) + spacing + 20)
+            for row_pos, col_pos in (self.face_positions[f] for f in range(6))
+        ], dtype=np.int32)
+        
+        # Size of the whole net: (max_col + 1) faces wide, (max_row + 1) faces tall, with
+        # spacing between and around faces (+20 for label space)
+        max_row = max(pos[0] for pos in self.face_positions.values())
+        max_col = max(pos[1] for pos in self.face_positions.values())
+        self._net_size = ((max_col + 1) * face_width + (max_col + 2) * spacing,
+                          (max_row + 1) * face_width + (max_row + 2) * spacing + 20)
+        
+        # Canvas item IDs for the 54 facelet rectangles, created once in _build()
+        self._rect_ids = np.zeros((6, 3, 3), dtype=np.int64)
+        self._offset = (0.0, 0.0)
+        self._build()
     
     def get_facelet_color(self, face_idx, row, col):
         """Get color code for a facelet."""
@@ -87,23 +113,19 @@ class CubeVisualizer:
         """Set color for a facelet."""
         self.faces[face_idx, row, col] = color_code
     
+    def recolor(self, face_idx, row, col, color_code):
+        """Set one facelet's color and update only its rectangle on the canvas."""
+        self.faces[face_idx, row, col] = color_code
+        self._last_faces[face_idx, row, col] = color_code
+        self.canvas.itemconfig(int(self._rect_ids[face_idx, row, col]), fill=self.color_values[color_code])
+    
     def set_face_color(self, face_idx, color_code):
         """Set entire face to one color."""
         self.faces[face_idx].fill(color_code)
     
-    def draw(self):
-        """Draw the cube net on the canvas."""
-        self.canvas.delete("all")
-        
-        # Calculate cube net dimensions
-        max_row = max(pos[0] for pos in self.face_positions.values())
-        max_col = max(pos[1] for pos in self.face_positions.values())
-        face_width = 3 * self.cell_size
-        
-        # Total width of cube net: (max_col + 1) faces + spacing between them
-        cube_width = (max_col + 1) * face_width + (max_col + 2) * self.spacing
-        # Total height of cube net: (max_row + 1) faces + spacing + label space
-        cube_height = (max_row + 1) * face_width + (max_row + 2) * self.spacing + 20  # +20 for labels
+    def _net_offset(self):
+        """Return the (x, y) offset that centers the cube net on the canvas."""
+        cube_width, cube_height = self._net_size
         
         # Get canvas dimensions
         canvas_width = self.canvas.winfo_width()
@@ -116,13 +138,15 @@ class CubeVisualizer:
             canvas_height = int(self.canvas['height'])
         
         # Calculate centering offsets
-        x_offset = (canvas_width - cube_width) / 2
-        y_offset = (canvas_height - cube_height) / 2
+        return ((canvas_width - cube_width) / 2, (canvas_height - cube_height) / 2)
+    
+    def _build(self):
+        """Create the 54 facelet rectangles and 6 face labels once."""
+        x_offset, y_offset = self._offset = self._net_offset()
         
         for face_idx in range(6):
-            row_pos, col_pos = self.face_positions[face_idx]
-            x_start = x_offset + col_pos * (face_width + self.spacing) + self.spacing
-            y_start = y_offset + row_pos * (face_width + self.spacing) + self.spacing + 20  # +20 for label space
+            x_start = x_offset + int(self._face_origins[face_idx, 0])
+            y_start = y_offset + int(self._face_origins[face_idx, 1])
             
             # Draw face label
             face_name = FACE_NAMES[face_idx]
@@ -130,7 +154,8 @@ class CubeVisualizer:
                 x_start + 1.5 * self.cell_size,
                 y_start - 15,
                 text=face_name,
-                font=('Arial', 10, 'bold')
+                font=('Arial', 10, 'bold'),
+                tags="cube"
             )
             
             # Draw 3x3 grid of facelets
@@ -143,48 +168,45 @@ class CubeVisualizer:
                     color = self.color_values[color_code]
                     
                     # Draw rectangle with border
-                    self.canvas.create_rectangle(
+                    self._rect_ids[face_idx, row, col] = self.canvas.create_rectangle(
                         x, y,
                         x + self.cell_size, y + self.cell_size,
                         fill=color,
                         outline='black',
                         width=2,
-                        tags=f"facelet_{face_idx}_{row}_{col}"
+                        tags=("cube", f"facelet_{face_idx}_{row}_{col}")
                     )
+        
+        self._last_faces = self.faces.copy()
+    
+    def draw(self):
+        """Redraw the cube net, recoloring only facelets that changed."""
+        # Keep the net centered if the canvas was resized
+        x_offset, y_offset = self._net_offset()
+        if (x_offset, y_offset) != self._offset:
+            self.canvas.move("cube", x_offset - self._offset[0], y_offset - self._offset[1])
+            self._offset = (x_offset, y_offset)
+        
+        cv = self.color_values
+        faces = self.faces
+        rect_ids = self._rect_ids
+        for face_idx, row, col in np.argwhere(faces != self._last_faces):
+            self.canvas.itemconfig(int(rect_ids[face_idx, row, col]), fill=cv[faces[face_idx, row, col]])
+        self._last_faces = self.faces.copy()
     
     def get_facelet_at_position(self, x, y):
         """Get facelet coordinates from canvas position."""
-        # Calculate cube net dimensions and offsets (same as in draw)
-        max_row = max(pos[0] for pos in self.face_positions.values())
-        max_col = max(pos[1] for pos in self.face_positions.values())
         face_width = 3 * self.cell_size
-        
-        cube_width = (max_col + 1) * face_width + (max_col + 2) * self.spacing
-        cube_height = (max_row + 1) * face_width + (max_row + 2) * self.spacing + 20
-        
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        if canvas_width <= 1:
-            canvas_width = int(self.canvas['width'])
-        if canvas_height <= 1:
-            canvas_height = int(self.canvas['height'])
-        
-        x_offset = (canvas_width - cube_width) / 2
-        y_offset = (canvas_height - cube_height) / 2
-        
-        for face_idx in range(6):
-            row_pos, col_pos = self.face_positions[face_idx]
-            x_start = x_offset + col_pos * (face_width + self.spacing) + self.spacing
-            y_start = y_offset + row_pos * (face_width + self.spacing) + self.spacing + 20
-            
-            if x_start <= x < x_start + 3 * self.cell_size:
-                if y_start <= y < y_start + 3 * self.cell_size:
-                    col = int((x - x_start) / self.cell_size)
-                    row = int((y - y_start) / self.cell_size)
-                    if 0 <= row < 3 and 0 <= col < 3:
-                        return (face_idx, row, col)
-        return None
+        x_offset, y_offset = self._net_offset()
+        dx = (x - x_offset) - self._face_origins[:, 0]
+        dy = (y - y_offset) - self._face_origins[:, 1]
+        mask = (dx >= 0) & (dx < face_width) & (dy >= 0) & (dy < face_width)
+        if not mask.any():
+            return None
+        face_idx = int(np.argmax(mask))
+        col = int(dx[face_idx] // self.cell_size)
+        row = int(dy[face_idx] // self.cell_size)
+        return (face_idx, row, col)
     
     def apply_move(self, move_name):
         """Apply a move to the visual representation."""
@@ -202,7 +224,6 @@ class CubeVisualizer:
     def to_cube_state(self):
         """Convert visual representation to cubie model."""
         try:
-            from cube_converter import faces_to_cubie_state
             return faces_to_cubie_state(self.faces)
         except Exception as e:
             print(f"Error converting to cubie state: {e}")
@@ -210,12 +231,9 @@ class CubeVisualizer:
     
     def from_cube_state(self, state: CubeState):
         """Convert cubie model to visual representation."""
-        try:
-            from cube_converter import cubie_state_to_faces
-            self.faces = cubie_state_to_faces(state)
-            self.draw()
-        except Exception as e:
-            print(f"Error converting from cubie state: {e}")
+        # Every CubeState maps to a face array, so there is no failure case to catch
+        cubie_state_to_faces(state, out=self.faces)
+        self.draw()
 
 
 class ColorPicker:
@@ -271,6 +289,12 @@ class CubeSolverGUI:
         self.solving = False
         self.current_scramble = None  # Store the current scramble string
         self.optimal_search = True  # Default to optimal search
+        self._anim_states = []  # Scrambled state followed by the state after each solution move
+        self._anim_moves = []
+        self._anim_index = 0
+        self._anim_job = None  # Pending root.after() id while animating
+        self._ui_queue = queue.Queue()  # (kind, *args) UI updates from the solver thread
+        self._solution_cache = OrderedDict()  # (state bytes, optimal) -> (moves, nodes, time), LRU order
         
         # Create main frame
         main_frame = ttk.Frame(root, padding="10")
@@ -426,6 +450,9 @@ class CubeSolverGUI:
         
         # Bind canvas click
         self.canvas.bind("<Button-1>", self.on_canvas_click)
+        
+        # Drain UI updates posted by the background solver
+        self._poll_ui_queue()
     
     def on_search_mode_change(self):
         """Handle search mode selection change."""
@@ -439,15 +466,11 @@ class CubeSolverGUI:
         if facelet:
             face_idx, row, col = facelet
             color_code = self.color_picker.get_color()
-            self.visualizer.set_facelet_color(face_idx, row, col, color_code)
-            self.visualizer.draw()
+            self.visualizer.recolor(face_idx, row, col, color_code)
     
     def reset_cube(self):
         """Reset cube to solved state."""
-        from cube_state import solved_state
-        from cube_converter import cubie_state_to_faces
-        solved = solved_state()
-        self.visualizer.faces = cubie_state_to_faces(solved)
+        self.visualizer.faces[...] = _SOLVED_FACES
         self.visualizer.draw()
         self.current_scramble = None  # Clear stored scramble
         self.status_label.config(text="Cube reset to solved state")
@@ -463,24 +486,23 @@ class CubeSolverGUI:
         dialog = tk.Toplevel(self.root)
         dialog.title("Load Scramble")
         dialog.geometry("400x150")
+        dialog.grid_columnconfigure(0, weight=1)
         
+        # Grid with fixed cells so the pre-sized dialog is laid out in one pass
         ttk.Label(
             dialog,
             text="Enter scramble moves (e.g., 'U R F2 D L'):"
-        ).pack(pady=10)
+        ).grid(row=0, column=0, pady=10)
         
         entry = ttk.Entry(dialog, width=40)
-        entry.pack(pady=5)
-        entry.focus()
+        entry.grid(row=1, column=0, pady=5)
         
         def apply_scramble():
             scramble_str = entry.get().strip()
             if scramble_str:
                 try:
-                    from utils import apply_moves
-                    state = solved_state()
                     moves = scramble_str.split()
-                    scrambled = apply_moves(state, moves)
+                    scrambled = compose_moves(moves).apply(solved_state())
                     # Update visualizer
                     self.visualizer.from_cube_state(scrambled)
                     # Store the scramble string for later use in solving
@@ -496,11 +518,14 @@ class CubeSolverGUI:
                     messagebox.showerror("Error", f"Invalid scramble: {e}")
             dialog.destroy()
         
-        ttk.Button(dialog, text="Apply", command=apply_scramble).pack(pady=10)
+        ttk.Button(dialog, text="Apply", command=apply_scramble).grid(row=2, column=0, pady=10)
         dialog.bind('<Return>', lambda e: apply_scramble())
+        
+        dialog.update_idletasks()
+        entry.focus()
     
     def solve_cube(self):
-        """Solve the cube using command-line interface."""
+        """Solve the cube with IDA* on a background thread."""
         if self.solving:
             messagebox.showwarning("Warning", "Solver is already running!")
             return
@@ -514,134 +539,103 @@ class CubeSolverGUI:
             )
             return
         
-        # Solve in background thread using command-line interface
+        # Solve in background thread so the Tk loop stays responsive
         self.solving = True
         self.status_label.config(text="Solving... Please wait...")
-        self.root.update()
+        
+        # Tk is not thread-safe: the worker only posts UI updates, _poll_ui_queue applies them
+        def post(*msg):
+            self._ui_queue.put(msg)
         
         def solve_thread():
             try:
-                self.status_label.config(text="Calling solver...")
-                self.root.update()
-                
-                # Get the directory of the current script
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                main_py = os.path.join(script_dir, "main.py")
+                # Reuse the answer if this exact state was already solved in this mode
+                state = apply_moves(solved_state(), self.current_scramble.split())
+                cache_key = (state.to_bytes(), self.optimal_search)
+                cached = self._solution_cache.get(cache_key)
                 
-                # Build command: python main.py --moves "scramble" with optional --suboptimal flag
-                cmd = [sys.executable, main_py, "--moves", self.current_scramble, "--max-iterations", "50"]
-                if not self.optimal_search:
-                    cmd.append("--suboptimal")
-                
-                # Run the command
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    cwd=script_dir,
-                    timeout=300  # 5 minute timeout
-                )
-                
-                # Parse output to extract solution
-                output = result.stdout
-                solution = None
-                nodes_expanded = None
-                elapsed_time = None
-                
-                # Look for solution - format: "Solution found (N moves):\n  R' U'"
-                lines = output.split('\n')
-                valid_move_set = set(MOVE_NAMES)  # Use set for O(1) lookup
-                
-                for i, line in enumerate(lines):
-                    if 'Solution found' in line:
-                        # Look at the next few lines for the solution moves
-                        for j in range(i + 1, min(i + 5, len(lines))):
-                            next_line = lines[j].strip()
-                            if next_line:
-                                # Split into potential moves
-                                potential_moves = next_line.split()
-                                # Validate: all moves should be valid cube moves
-                                if potential_moves and all(move in valid_move_set for move in potential_moves):
-                                    solution = potential_moves
-                                    break
-                        if solution:
-                            break
+                if cached is not None:
+                    self._solution_cache.move_to_end(cache_key)
+                    solution, nodes_expanded, elapsed_time = cached
+                else:
+                    # Pattern databases are loaded once and shared by every later solve
+                    if self.heuristic is None:
+                        post('status', "Loading pattern databases...")
+                        script_dir = os.path.dirname(os.path.abspath(__file__))
+                        # Build serially: forking worker processes from this threaded Tk process is unsafe
+                        self.heuristic = get_heuristic(cache_dir=os.path.join(script_dir, "pdb_cache"),
+                                                       parallel=False)
+                    
+                    post('status', "Searching...")
+                    solver = IDAStar(self.heuristic, optimal=self.optimal_search)
+                    start_time = time.perf_counter()
+                    solution = solver.solve(state, max_iterations=50, verbose=False,
+                                            time_limit=SOLVE_TIME_LIMIT)
+                    elapsed_time = time.perf_counter() - start_time
+                    nodes_expanded = solver.nodes_expanded
+                    
+                    if solution is not None:
+                        self._solution_cache[cache_key] = (solution, nodes_expanded, elapsed_time)
+                        if len(self._solution_cache) > SOLUTION_CACHE_SIZE:
+                            self._solution_cache.popitem(last=False)
                 
-                # Look for statistics
-                nodes_match = re.search(r'Nodes expanded:\s*([\d,]+)', output)
-                if nodes_match:
-                    nodes_expanded = nodes_match.group(1).replace(',', '')
+                if solution is None:
+                    self.solution = None
+                    post('result', "No solution found within limits.", "", "No solution found")
+                    post('warning', "Warning", "No solution found within iteration limit.")
+                    return
                 
-                time_match = re.search(r'Time:\s*([\d.]+)\s*seconds', output)
-                if time_match:
-                    elapsed_time = float(time_match.group(1))
+                self.solution = solution
+                solution_str = " ".join(solution)
                 
-                # Check for errors (but only if we didn't find a solution)
-                if not solution:
-                    if result.returncode != 0 or "No solution found" in output:
-                        self.solution = None
-                        self.solution_text.config(state=tk.NORMAL)
-                        self.solution_text.delete(1.0, tk.END)
-                        self.solution_text.insert(1.0, "No solution found within limits.")
-                        self.solution_text.config(state=tk.DISABLED)
-                        self.solution_stats_label.config(text="")
-                        self.status_label.config(text="No solution found")
-                        messagebox.showwarning("Warning", "No solution found within iteration limit.")
-                        return
+                # Statistics are displayed separately from the solution moves
+                stats_parts = []
+                stats_parts.append(f"{len(solution)} moves")
+                if nodes_expanded:
+                    stats_parts.append(f"Nodes: {nodes_expanded}")
+                if elapsed_time:
+                    stats_parts.append(f"Time: {elapsed_time:.2f}s")
+                stats_text = " | ".join(stats_parts)
                 
-                if solution:
-                    self.solution = solution
-                    solution_str = " ".join(solution)
-                    
-                    # Display solution moves (full solution in readable format)
-                    self.solution_text.config(state=tk.NORMAL)
-                    self.solution_text.delete(1.0, tk.END)
-                    self.solution_text.insert(1.0, solution_str)
-                    self.solution_text.config(state=tk.DISABLED)
+                # Display solution moves (full solution in readable format)
+                post('result', solution_str, stats_text, f"Solution found! {len(solution)} moves")
                     
-                    # Display statistics separately
-                    stats_parts = []
-                    stats_parts.append(f"{len(solution)} moves")
-                    if nodes_expanded:
-                        stats_parts.append(f"Nodes: {nodes_expanded}")
-                    if elapsed_time:
-                        stats_parts.append(f"Time: {elapsed_time:.2f}s")
-                    stats_text = " | ".join(stats_parts)
-                    self.solution_stats_label.config(text=stats_text)
-                    
-                    self.status_label.config(text=f"Solution found! {len(solution)} moves")
-                else:
-                    # Fallback: try to extract from output even if regex didn't match
-                    # Show last part of output for debugging
-                    self.solution = None
-                    self.solution_text.config(state=tk.NORMAL)
-                    self.solution_text.delete(1.0, tk.END)
-                    error_msg = "Could not parse solution from output.\n\n"
-                    error_msg += "Last 500 characters of output:\n"
-                    error_msg += output[-500:] if len(output) > 500 else output
-                    self.solution_text.insert(1.0, error_msg)
-                    self.solution_text.config(state=tk.DISABLED)
-                    self.solution_stats_label.config(text="")
-                    self.status_label.config(text="Error parsing solution")
-                    
-                    # Try to show more helpful error message
-                    if "No solution found" in output:
-                        messagebox.showwarning("Warning", "No solution found within iteration limit.")
-                    else:
-                        messagebox.showerror("Error", f"Could not parse solution from solver output.\n\nCheck the output below for details.")
-                    
-            except subprocess.TimeoutExpired:
-                messagebox.showerror("Error", "Solver timed out after 5 minutes.")
-                self.status_label.config(text="Solver timed out")
+            except SearchTimeout:
+                post('error', "Error", f"Solver timed out after {SOLVE_TIME_LIMIT} seconds.")
+                post('status', "Solver timed out")
             except Exception as e:
-                messagebox.showerror("Error", f"Error during solving: {e}")
-                self.status_label.config(text="Error during solving")
+                post('error', "Error", f"Error during solving: {e}")
+                post('status', "Error during solving")
             finally:
                 self.solving = False
         
         thread = threading.Thread(target=solve_thread, daemon=True)
         thread.start()
     
+    def _poll_ui_queue(self):
+        """Apply UI updates posted by the solver thread, then re-arm the poll."""
+        try:
+            while True:
+                kind, *args = self._ui_queue.get_nowait()
+                if kind == 'status':
+                    self.status_label.config(text=args[0])
+                elif kind == 'result':
+                    # One Text replace per solve: solution (or error) text, stats, status
+                    text, stats_text, status_text = args
+                    self.solution_text.config(state=tk.NORMAL)
+                    self.solution_text.delete(1.0, tk.END)
+                    self.solution_text.insert(1.0, text)
+                    self.solution_text.config(state=tk.DISABLED)
+                    self.solution_stats_label.config(text=stats_text)
+                    self.status_label.config(text=status_text)
+                elif kind == 'warning':
+                    messagebox.showwarning(*args)
+                elif kind == 'error':
+                    messagebox.showerror(*args)
+        except queue.Empty:
+            pass
+        self.root.after(50, self._poll_ui_queue)
+    
     def animate_solution(self):
         """Animate the solution steps."""
         if not self.solution:
@@ -657,40 +651,59 @@ class CubeSolverGUI:
             )
             return
         
+        # Cancel an animation that is still running
+        if self._anim_job is not None:
+            self.root.after_cancel(self._anim_job)
+            self._anim_job = None
+        
         self.status_label.config(text="Animating solution...")
         
         # Recreate the scrambled state from the stored scramble string
         # This ensures we start from the exact same state the solution was computed for
         try:
-            from utils import apply_moves
             # Start from solved state
             current_state = solved_state()
             # Apply the scramble moves to recreate the initial scrambled state
             scramble_moves = self.current_scramble.split()
             current_state = apply_moves(current_state, scramble_moves)
-            
-            # Update visualizer to show the scrambled state first
-            self.visualizer.from_cube_state(current_state)
-            self.root.update()
-            time.sleep(1.0)  # Brief pause before starting solution
-            
         except Exception as e:
             messagebox.showerror("Error", f"Error recreating scrambled state: {e}")
             return
         
-        # Animate each move in the solution
-        for i, move_name in enumerate(self.solution):
+        # Pre-apply every move up front so each animation frame only has to redraw
+        self._anim_states = [current_state]
+        self._anim_moves = []
+        for move_name in self.solution:
             if move_name in MOVE_TABLE:
-                # Apply the move to the state
                 current_state = MOVE_TABLE[move_name].apply(current_state)
-                # Update visualizer
-                self.visualizer.from_cube_state(current_state)
-                self.status_label.config(text=f"Animating solution... Move {i+1}/{len(self.solution)}: {move_name}")
-                self.root.update()
-                time.sleep(1.5)  # Delay between moves
+                self._anim_states.append(current_state)
+                self._anim_moves.append(move_name)
+        self._anim_index = 0
+        
+        # Show the scrambled state first, then step through the solution
+        # from Tk's event loop so the window stays responsive
+        self.visualizer.from_cube_state(self._anim_states[0])
+        self._anim_job = self.root.after(1000, self._anim_step)  # Brief pause before starting solution
+    
+    def _anim_step(self):
+        """Show the next pre-applied animation state and re-arm the timer."""
+        t0 = time.perf_counter()
+        self._anim_index += 1
+        if self._anim_index < len(self._anim_states):
+            i = self._anim_index
+            self.visualizer.from_cube_state(self._anim_states[i])
+            self.status_label.config(
+                text=f"Animating solution... Move {i}/{len(self._anim_moves)}: {self._anim_moves[i - 1]}"
+            )
+            # Delay between moves, minus the time this frame took, so the pace stays steady
+            spent_ms = int((time.perf_counter() - t0) * 1000)
+            self._anim_job = self.root.after(max(0, ANIMATION_STEP_MS - spent_ms), self._anim_step)
+            return
+        
+        self._anim_job = None
         
         # Verify final state
-        if current_state.is_solved():
+        if self._anim_states[-1].is_solved():
             self.status_label.config(text="Animation complete! Cube is solved!")
             messagebox.showinfo("Success", "Solution animation complete! Cube is solved!")
         else:
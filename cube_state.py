@@ -8,12 +8,24 @@ A cube state is represented as (p_c, o_c, p_e, o_e) where:
 - o_e: edge orientations (0 or 1)
 """
 
+import numpy as np
+
+
+# Layout of the 40-byte state buffer: corner_perm, corner_orient, edge_perm, edge_orient
+_SOLVED = np.array(list(range(8)) + [0] * 8 + list(range(12)) + [0] * 12, dtype=np.uint8)
+_SOLVED.flags.writeable = False
+_SOLVED_BYTES = _SOLVED.tobytes()
+
 
 class CubeState:
     """Represents a 3x3x3 Rubik's Cube state using the cubie model."""
     
     # Corner positions: 8 corners indexed 0-7
     # Edge positions: 12 edges indexed 0-11
+    # All four components live in one contiguous uint8 array (_data) so copying,
+    # hashing and comparing a state are single C-level operations over 40 bytes.
+    # No per-instance __dict__: a state is just the object header plus that array.
+    __slots__ = ('_data',)
     
     def __init__(self, 
                  corner_perm: list = None,
@@ -31,31 +43,97 @@ class CubeState:
         """
         if corner_perm is None:
             # Solved state
-            self.corner_perm = list(range(8))
-            self.corner_orient = [0] * 8
-            self.edge_perm = list(range(12))
-            self.edge_orient = [0] * 12
+            self._data = _SOLVED.copy()
         else:
-            self.corner_perm = list(corner_perm)
-            self.corner_orient = list(corner_orient)
-            self.edge_perm = list(edge_perm)
-            self.edge_orient = list(edge_orient)
+            self._data = np.array([*corner_perm, *corner_orient, *edge_perm, *edge_orient], dtype=np.uint8)
+    
+    # Component views into _data (writes go through to the state)
+    
+    @property
+    def corner_perm(self) -> np.ndarray:
+        return self._data[0:8]
+    
+    @corner_perm.setter
+    def corner_perm(self, value):
+        self._data[0:8] = value
+    
+    @property
+    def corner_orient(self) -> np.ndarray:
+        return self._data[8:16]
+    
+    @corner_orient.setter
+    def corner_orient(self, value):
+        self._data[8:16] = value
+    
+    @property
+    def edge_perm(self) -> np.ndarray:
+        return self._data[16:28]
+    
+    @edge_perm.setter
+    def edge_perm(self, value):
+        self._data[16:28] = value
+    
+    @property
+    def edge_orient(self) -> np.ndarray:
+        return self._data[28:40]
+    
+    @edge_orient.setter
+    def edge_orient(self, value):
+        self._data[28:40] = value
     
     def copy(self):
-        """Create a copy of this state. Optimized for performance."""
+        """Create a copy of this state (one 40-byte memcpy)."""
         s = CubeState.__new__(CubeState)
-        s.corner_perm = self.corner_perm[:]   # list slice copy only
-        s.corner_orient = self.corner_orient[:]
-        s.edge_perm = self.edge_perm[:]
-        s.edge_orient = self.edge_orient[:]
+        s._data = self._data.copy()
         return s
     
+    def to_bytes(self) -> bytes:
+        """
+        Return the state as a canonical 40-byte key for caches and transposition tables.
+        
+        Layout: corner_perm (8), corner_orient (8), edge_perm (12), edge_orient (12).
+        """
+        return self._data.tobytes()
+    
+    @staticmethod
+    def from_bytes(key: bytes) -> 'CubeState':
+        """Inverse of to_bytes() (the state is a read-only view of key, use copy() to modify)."""
+        state = CubeState.__new__(CubeState)
+        state._data = np.frombuffer(key, dtype=np.uint8)
+        return state
+    
+    def coord(self) -> int:
+        """Return the 40-byte state as a single int, a cheap dict key for transposition tables."""
+        return int.from_bytes(self._data.tobytes(), 'little')
+    
+    def pack(self) -> tuple:
+        """
+        Pack the state into two 64-bit ints (corners, edges).
+        
+        corners: corner_perm 8x3 bits, then corner_orient 8x2 bits at bit 24
+        edges: edge_perm 12x4 bits, then edge_orient 12x1 bits at bit 48
+        """
+        data = self._data.tolist()
+        corners = 0
+        for i in range(8):
+            corners |= (data[i] << (3 * i)) | (data[8 + i] << (24 + 2 * i))
+        edges = 0
+        for i in range(12):
+            edges |= (data[16 + i] << (4 * i)) | (data[28 + i] << (48 + i))
+        return corners, edges
+    
+    @staticmethod
+    def unpack(packed: tuple) -> 'CubeState':
+        """Inverse of pack()."""
+        corners, edges = packed
+        return CubeState([(corners >> (3 * i)) & 0x7 for i in range(8)],
+                         [(corners >> (24 + 2 * i)) & 0x3 for i in range(8)],
+                         [(edges >> (4 * i)) & 0xF for i in range(12)],
+                         [(edges >> (48 + i)) & 0x1 for i in range(12)])
+    
     def is_solved(self) -> bool:
         """Check if the cube is in the solved state."""
-        return (self.corner_perm == list(range(8)) and
-                all(x == 0 for x in self.corner_orient) and
-                self.edge_perm == list(range(12)) and
-                all(x == 0 for x in self.edge_orient))
+        return self._data.tobytes() == _SOLVED_BYTES
     
     def is_valid(self) -> bool:
         """
@@ -64,59 +142,44 @@ class CubeState:
         - Sum of corner orientations ≡ 0 (mod 3)
         - Sum of edge orientations ≡ 0 (mod 2)
         """
+        data = self._data
+        
         # Check permutation parity
-        corner_parity = self._permutation_parity(self.corner_perm)
-        edge_parity = self._permutation_parity(self.edge_perm)
+        corner_parity = self._permutation_parity(data[0:8])
+        edge_parity = self._permutation_parity(data[16:28])
         if corner_parity != edge_parity:
             return False
         
-        # Check corner orientation sum
-        if sum(self.corner_orient) % 3 != 0:
+        # Check corner orientation sum (NumPy sums uint8 in a wider type, so no overflow)
+        if int(data[8:16].sum()) % 3 != 0:
             return False
         
         # Check edge orientation sum
-        if sum(self.edge_orient) % 2 != 0:
+        if int(data[28:40].sum()) & 1:
             return False
         
         return True
     
     @staticmethod
-    def _permutation_parity(perm: list) -> int:
-        """Compute the parity (sign) of a permutation. Returns 0 for even, 1 for odd."""
-        n = len(perm)
-        visited = [False] * n
-        parity = 0
-        
-        for i in range(n):
-            if not visited[i]:
-                cycle_length = 0
-                j = i
-                while not visited[j]:
-                    visited[j] = True
-                    j = perm[j]
-                    cycle_length += 1
-                if cycle_length > 1:
-                    parity = (parity + cycle_length - 1) % 2
+    def _permutation_parity(perm) -> int:
+        """
+        Compute the parity (sign) of a permutation. Returns 0 for even, 1 for odd.
         
-        return parity
+        Parity is the inversion count mod 2; all i < j pairs are compared in one NumPy call.
+        """
+        perm = np.asarray(perm)
+        inversions = np.triu(perm[:, None] > perm[None, :], k=1)
+        return int(np.count_nonzero(inversions)) & 1
     
     def __eq__(self, other):
         """Check equality of two cube states."""
         if not isinstance(other, CubeState):
             return False
-        return (self.corner_perm == other.corner_perm and
-                self.corner_orient == other.corner_orient and
-                self.edge_perm == other.edge_perm and
-                self.edge_orient == other.edge_orient)
+        return self._data.tobytes() == other._data.tobytes()
     
     def __hash__(self):
         """Hash function for use in sets/dicts."""
-        return hash((
-            tuple(self.corner_perm),
-            tuple(self.corner_orient),
-            tuple(self.edge_perm),
-            tuple(self.edge_orient)
-        ))
+        return hash(self._data.tobytes())
 
 
 def solved_state() -> CubeState:
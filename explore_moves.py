@@ -148,9 +148,8 @@ def demonstrate_application():
     print(f"   corner_perm = {list(move.corner_perm)}")
     print(f"   corner_orient_delta = {list(move.corner_orient_delta)}")
     
-    print("\n3. Compute inverse permutation:")
-    import numpy as np
-    corner_perm_inv = np.argsort(move.corner_perm)
+    print("\n3. Inverse permutation (precomputed once when the move is built):")
+    corner_perm_inv = move.corner_perm_inv
     print(f"   corner_perm_inv = {list(corner_perm_inv)}")
     print("   (This tells us where each cubie came from)")
     
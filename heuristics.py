@@ -2,16 +2,23 @@
 Heuristic functions using pattern databases (Korf-style).
 """
 
+import numpy as np
 from cube_state import CubeState
 from pattern_databases import (
     CornerFullPDB,
     Edge6PDB,
     build_korf_pdbs,
+    PDB_UNREACHED,
     EDGE_SET_1_POSITIONS,
     EDGE_SET_2_POSITIONS
 )
 
 
+def _lookup_packed(table: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Read the 4-bit entries at indices from a packed PDB table."""
+    return (table[indices >> 1] >> ((indices & 1) << 2)) & 0xF
+
+
 class Heuristic:
     """
     Combined heuristic using Korf-style pattern databases.
@@ -27,7 +34,8 @@ class Heuristic:
     def __init__(self, corner_pdb: CornerFullPDB = None,
                  edge6a_pdb: Edge6PDB = None,
                  edge6b_pdb: Edge6PDB = None,
-                 cache_dir: str = "pdb_cache"):
+                 cache_dir: str = "pdb_cache",
+                 parallel: bool = True):
         """
         Initialize heuristic with Korf-style pattern databases.
         
@@ -36,6 +44,7 @@ class Heuristic:
             edge6a_pdb: Edge6PDB instance (built/loaded if None)
             edge6b_pdb: Edge6PDB instance (built/loaded if None)
             cache_dir: Directory for caching PDB files (default: "pdb_cache")
+            parallel: Build missing PDBs in worker processes (see build_korf_pdbs)
         
         If PDBs are None, they will be built/loaded automatically from cache.
         """
@@ -43,11 +52,23 @@ class Heuristic:
             print("Loading/Building Korf-style pattern databases...")
             print("  (Will use cache if available, otherwise will build)")
             print()
-            corner_pdb, edge6a_pdb, edge6b_pdb = build_korf_pdbs(cache_dir=cache_dir)
+            corner_pdb, edge6a_pdb, edge6b_pdb = build_korf_pdbs(cache_dir=cache_dir, parallel=parallel)
         
         self.corner_pdb = corner_pdb
         self.edge6a_pdb = edge6a_pdb
         self.edge6b_pdb = edge6b_pdb
+        
+        # Raw packed tables (two 4-bit entries per byte) and bound abstraction functions,
+        # so h() does three plain indexed loads with no PatternDatabase.get() dispatch
+        self._corner_table = np.ascontiguousarray(corner_pdb.pdb, dtype=np.uint8)
+        self._edge6a_table = np.ascontiguousarray(edge6a_pdb.pdb, dtype=np.uint8)
+        self._edge6b_table = np.ascontiguousarray(edge6b_pdb.pdb, dtype=np.uint8)
+        self._corner_abstract = corner_pdb.abstract
+        self._edge6a_abstract = edge6a_pdb.abstract
+        self._edge6b_abstract = edge6b_pdb.abstract
+        self._corner_abstract_batch = corner_pdb.abstract_batch
+        self._edge6a_abstract_batch = edge6a_pdb.abstract_batch
+        self._edge6b_abstract_batch = edge6b_pdb.abstract_batch
     
     def h_corner(self, state: CubeState) -> float:
         """Corner full heuristic (permutation + orientation)."""
@@ -74,9 +95,53 @@ class Heuristic:
         Returns:
             Heuristic value: max(h_corner, h_edge6A, h_edge6B)
         """
-        h_corner = self.h_corner(state)
-        h_edge6a = self.h_edge6a(state)
-        h_edge6b = self.h_edge6b(state)
+        i = self._corner_abstract(state)
+        a = self._edge6a_abstract(state)
+        b = self._edge6b_abstract(state)
+        h = max((self._corner_table.item(i >> 1) >> ((i & 1) << 2)) & 0xF,
+                (self._edge6a_table.item(a >> 1) >> ((a & 1) << 2)) & 0xF,
+                (self._edge6b_table.item(b >> 1) >> ((b & 1) << 2)) & 0xF)
+        return float('inf') if h == PDB_UNREACHED else float(h)
+    
+    def h_batch(self, states: np.ndarray) -> np.ndarray:
+        """
+        Vectorized h() over many states, e.g. all successors from moves.expand_all().
         
-        return max(h_corner, h_edge6a, h_edge6b)
+        Args:
+            states: (N, 40) uint8 array of CubeState buffers
+        
+        Returns:
+            (N,) float64 array of max(h_corner, h_edge6A, h_edge6B), inf where unreached
+        """
+        h = np.maximum(np.maximum(_lookup_packed(self._corner_table, self._corner_abstract_batch(states)),
+                                  _lookup_packed(self._edge6a_table, self._edge6a_abstract_batch(states))),
+                       _lookup_packed(self._edge6b_table, self._edge6b_abstract_batch(states)))
+        h = h.astype(np.float64)
+        h[h == PDB_UNREACHED] = np.inf
+        return h
 
+
+# Heuristics already loaded in this process, keyed by PDB cache directory
+_HEURISTIC_CACHE = {}
+
+
+def get_heuristic(cache_dir: str = "pdb_cache", parallel: bool = True) -> Heuristic:
+    """
+    Return a shared Heuristic, loading its pattern databases at most once per process.
+    
+    The PDB arrays are persisted by build_korf_pdbs under cache_dir, so only
+    the very first run pays the build cost; later calls reuse the loaded tables.
+    
+    Args:
+        cache_dir: Directory for caching PDB files (default: "pdb_cache")
+        parallel: Build missing PDBs in worker processes (default True); pass False
+                  from threaded callers such as the GUI, where forking is unsafe
+    
+    Returns:
+        Heuristic instance shared by every caller using the same cache_dir
+    """
+    heuristic = _HEURISTIC_CACHE.get(cache_dir)
+    if heuristic is None:
+        heuristic = Heuristic(cache_dir=cache_dir, parallel=parallel)
+        _HEURISTIC_CACHE[cache_dir] = heuristic
+    return heuristic
@@ -5,7 +5,7 @@ Main interface for the Rubik's Cube solver.
 import argparse
 import time
 from cube_state import CubeState, solved_state
-from heuristics import Heuristic
+from heuristics import get_heuristic
 from search import IDAStar
 from utils import scramble, apply_moves, format_solution, verify_solution
 
@@ -25,7 +25,7 @@ def main():
     parser.add_argument('--save-pdb', action='store_true',
                        help='Save pattern databases to disk (not implemented)')
     parser.add_argument('--load-pdb', type=str, default=None,
-                       help='Load pattern databases from disk (not implemented)')
+                       help='Directory of cached pattern databases to load (default: pdb_cache)')
     parser.add_argument('--suboptimal', action='store_true',
                        help='Use suboptimal search (returns first solution found, faster). Default is optimal search.')
     
@@ -60,8 +60,9 @@ def main():
         print("Cube is already solved!")
         return
     
-    # Verify state is valid
-    if not initial_state.is_valid():
+    # Verify state is valid (random scrambles are valid by construction, so only
+    # check states built from user-supplied moves)
+    if args.moves and not initial_state.is_valid():
         print("WARNING: Initial state does not satisfy physical constraints!")
         print("This should not happen with a valid scramble.")
         return
@@ -76,10 +77,9 @@ def main():
     # Build or load heuristics
     if args.load_pdb:
         print(f"Loading pattern databases from {args.load_pdb}...")
-        # TODO: Implement PDB loading
-        heuristic = Heuristic()
+        heuristic = get_heuristic(cache_dir=args.load_pdb)
     else:
-        heuristic = Heuristic()
+        heuristic = get_heuristic()
     
     solver = IDAStar(heuristic, optimal=not args.suboptimal)
     solution = solver.solve(initial_state, args.max_iterations)
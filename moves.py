@@ -8,13 +8,12 @@ Each move is represented as (σ_c, δ_c, σ_e, δ_e) where:
 - δ_e: change in edge orientation
 """
 
+import numpy as np
 from cube_state import CubeState
 
 # Reusable temp buffers (Fix #3 - allocate once globally)
 TEMP_CORNER_PERM = [0] * 8
 TEMP_CORNER_ORIENT = [0] * 8
-TEMP_EDGE_PERM = [0] * 12
-TEMP_EDGE_ORIENT = [0] * 12
 
 # Move names in quarter-turn metric
 MOVE_NAMES = [
@@ -52,6 +51,31 @@ for face, moves in FACE_TO_MOVES.items():
     for move_name in moves:
         MOVE_TO_FACE[move_name] = face
 
+# Opposite faces commute (U D == D U), so canonical move sequences fix one order per axis:
+# (last_face, next_face) pairs that are skipped because the other order is searched instead
+COMMUTING_FACE_SKIPS = {('D', 'U'), ('R', 'L'), ('B', 'F')}
+
+
+def _compile_apply(perm_idx: list, corner_orient_delta: list, edge_orient_delta: list):
+    """
+    Generate a move's apply_fast() as straight-line Python.
+    
+    Every gather index and orientation delta is folded to a literal, so the
+    function is one list display with no loops, arrays or lookups.
+    
+    Returns:
+        function(d) -> successor of d, both 40-int lists in the CubeState buffer layout
+    """
+    terms = [f'd[{j}]' for j in perm_idx[0:8]]
+    for j, delta in zip(perm_idx[8:16], corner_orient_delta):
+        terms.append(f'(d[{j}] + {delta}) % 3' if delta else f'd[{j}]')
+    terms += [f'd[{j}]' for j in perm_idx[16:28]]
+    for j, delta in zip(perm_idx[28:40], edge_orient_delta):
+        terms.append(f'd[{j}] ^ 1' if delta else f'd[{j}]')
+    namespace = {}
+    exec('def _apply(d):\n    return [' + ', '.join(terms) + ']', namespace)
+    return namespace['_apply']
+
 
 class Move:
     """Represents a move on the cube."""
@@ -85,14 +109,27 @@ class Move:
         self.edge_perm_inv = [0] * 12
         for i in range(12):
             self.edge_perm_inv[self.edge_perm[i]] = i
+        
+        # Gather index over the whole 40-byte state buffer: new = old[perm_idx]
+        perm_idx = (self.corner_perm_inv
+                    + [8 + j for j in self.corner_perm_inv]
+                    + [16 + j for j in self.edge_perm_inv]
+                    + [28 + j for j in self.edge_perm_inv])
+        self.perm_idx = np.array(perm_idx, dtype=np.intp)
+        self.corner_orient_delta_arr = np.array(self.corner_orient_delta, dtype=np.uint8)
+        self.edge_orient_delta_arr = np.array(self.edge_orient_delta, dtype=np.uint8)
+        
+        # Specialized pure-Python apply over state._data.tolist() (see _compile_apply)
+        self.apply_fast = _compile_apply(perm_idx, self.corner_orient_delta, self.edge_orient_delta)
     
     def apply(self, state: CubeState) -> CubeState:
         """
         Apply this move to a state, returning a new state.
         (Kept for backward compatibility, but use apply_in_place for performance)
         """
-        new_state = state.copy()
-        self.apply_in_place(new_state)
+        new_state = CubeState.__new__(CubeState)
+        new_state._data = data = state._data[self.perm_idx]
+        self._twist(data)
         return new_state
     
     def apply_in_place(self, state: CubeState):
@@ -105,31 +142,49 @@ class Move:
         - p_e'(i) = p_e(σ_e^{-1}(i))
         - o_e'(i) = (o_e(σ_e^{-1}(i)) + δ_e(i)) mod 2
         """
-        # Use module-level reusable temp buffers (Fix #3 - no allocations!)
-        temp_corner_perm = TEMP_CORNER_PERM
-        temp_corner_orient = TEMP_CORNER_ORIENT
-        temp_edge_perm = TEMP_EDGE_PERM
-        temp_edge_orient = TEMP_EDGE_ORIENT
-        
-        # Apply corner permutation and orientation
-        for i in range(8):
-            j = self.corner_perm_inv[i]
-            temp_corner_perm[i] = state.corner_perm[j]
-            temp_corner_orient[i] = (state.corner_orient[j] + self.corner_orient_delta[i]) % 3
+        # One gather over the 40-byte buffer (fancy indexing copies, so writing back is safe)
+        data = state._data
+        data[:] = data[self.perm_idx]
+        self._twist(data)
+    
+    def apply_into(self, state: CubeState, out: CubeState):
+        """
+        Write this move applied to state into out, without allocating.
         
-        # Apply edge permutation and orientation
-        for i in range(12):
-            j = self.edge_perm_inv[i]
-            temp_edge_perm[i] = state.edge_perm[j]
-            temp_edge_orient[i] = (state.edge_orient[j] + self.edge_orient_delta[i]) % 2
+        The gather and the orientation updates run in place over out's buffer,
+        so a caller expanding many successors can reuse one scratch state.
+        """
+        data = out._data
+        np.take(state._data, self.perm_idx, out=data)
+        self._twist(data)
+    
+    def _twist(self, data: np.ndarray):
+        """Add this move's orientation deltas to an already permuted state buffer."""
+        corner_orient = data[8:16]
+        corner_orient += self.corner_orient_delta_arr
+        np.remainder(corner_orient, 3, out=corner_orient)
+        data[28:40] ^= self.edge_orient_delta_arr
+    
+    def compose(self, other: 'Move') -> 'Move':
+        """
+        Return the single move equivalent to applying this move, then other.
         
-        # Copy back to state
-        for i in range(8):
-            state.corner_perm[i] = temp_corner_perm[i]
-            state.corner_orient[i] = temp_corner_orient[i]
-        for i in range(12):
-            state.edge_perm[i] = temp_edge_perm[i]
-            state.edge_orient[i] = temp_edge_orient[i]
+        With a = self and b = other:
+        - σ(i) = σ_b(σ_a(i))
+        - δ(i) = (δ_a(σ_b^{-1}(i)) + δ_b(i)) mod 3 (corners) / mod 2 (edges)
+        """
+        corner_perm = [other.corner_perm[self.corner_perm[i]] for i in range(8)]
+        corner_orient_delta = [
+            (self.corner_orient_delta[other.corner_perm_inv[i]] + other.corner_orient_delta[i]) % 3
+            for i in range(8)
+        ]
+        edge_perm = [other.edge_perm[self.edge_perm[i]] for i in range(12)]
+        edge_orient_delta = [
+            (self.edge_orient_delta[other.edge_perm_inv[i]] + other.edge_orient_delta[i]) % 2
+            for i in range(12)
+        ]
+        return Move(f"{self.name} {other.name}", corner_perm, corner_orient_delta,
+                    edge_perm, edge_orient_delta)
     
     def __repr__(self):
         return self.name
@@ -285,3 +340,48 @@ for name, move in MOVE_TABLE.items():
 ALL_MOVES = [MOVE_TABLE[name] for name in MOVE_NAMES]
 
 
+def next_moves_table(canonical: bool = True) -> dict:
+    """
+    Precompute the successor moves worth searching after each move.
+    
+    A move on the same face as the previous one (including its inverse) is never
+    useful, and with canonical=True only one order of each commuting opposite-face
+    pair is kept.
+    
+    Returns:
+        dict mapping the previous move name (None at the root) to a list of
+        (index into ALL_MOVES, Move) pairs
+    """
+    table = {None: list(enumerate(ALL_MOVES))}
+    for prev in MOVE_NAMES:
+        prev_face = MOVE_TO_FACE[prev]
+        table[prev] = [(k, move) for k, move in enumerate(ALL_MOVES)
+                       if MOVE_TO_FACE[move.name] != prev_face
+                       and not (canonical and (prev_face, MOVE_TO_FACE[move.name]) in COMMUTING_FACE_SKIPS)]
+    return table
+
+
+# Canonical successor lists: 18 moves at the root, then 15 or 12 per node
+NEXT_MOVES = next_moves_table()
+
+# Gather indices and orientation deltas of ALL_MOVES stacked, shapes (18, 40), (18, 8), (18, 12)
+ALL_MOVES_PERM_IDX = np.stack([move.perm_idx for move in ALL_MOVES])
+ALL_MOVES_CORNER_ORIENT_DELTA = np.stack([move.corner_orient_delta_arr for move in ALL_MOVES])
+ALL_MOVES_EDGE_ORIENT_DELTA = np.stack([move.edge_orient_delta_arr for move in ALL_MOVES])
+
+
+def expand_all(state: CubeState) -> np.ndarray:
+    """
+    Generate every successor of state in one vectorized step.
+    
+    Returns:
+        (18, 40) uint8 array; row k is the state buffer after ALL_MOVES[k]
+    """
+    children = state._data[ALL_MOVES_PERM_IDX]
+    corner_orient = children[:, 8:16]
+    corner_orient += ALL_MOVES_CORNER_ORIENT_DELTA
+    np.remainder(corner_orient, 3, out=corner_orient)
+    children[:, 28:40] ^= ALL_MOVES_EDGE_ORIENT_DELTA
+    return children
+
+
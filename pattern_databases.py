@@ -11,8 +11,23 @@ import os
 import pickle
 from math import comb
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from cube_state import CubeState, solved_state
-from moves import ALL_MOVES, MOVE_TABLE, MOVE_INVERSE_TABLE, TEMP_CORNER_PERM, TEMP_CORNER_ORIENT
+from moves import ALL_MOVES, MOVE_TABLE, TEMP_CORNER_PERM, TEMP_CORNER_ORIENT
+
+
+# PDB entries are move counts (at most 11 for corners, 10 for edge6) packed two per
+# byte: entry i is the low nibble of byte i >> 1 when i is even, the high nibble when
+# odd. This nibble value marks an unreached entry.
+PDB_UNREACHED = 0xF
+
+
+def pack_nibbles(depths: np.ndarray) -> np.ndarray:
+    """Pack a one-byte-per-entry depth table (values <= 15) into the two-per-byte PDB layout."""
+    depths = np.asarray(depths, dtype=np.uint8)
+    if len(depths) % 2:
+        depths = np.append(depths, np.uint8(PDB_UNREACHED))
+    return depths[0::2] | (depths[1::2] << 4)
 
 
 class PatternDatabase:
@@ -20,12 +35,15 @@ class PatternDatabase:
     
     def __init__(self, size: int):
         self.size = size
-        self.pdb = np.full(size, np.inf, dtype=np.float32)
+        # Packed table, assigned by build() (or load()) once the depths are known
+        self.pdb = None
     
     def get(self, index: int) -> float:
         """Get heuristic value for a given abstract state index."""
         if 0 <= index < self.size:
-            return self.pdb[index]
+            value = (int(self.pdb[index >> 1]) >> ((index & 1) << 2)) & 0xF
+            if value != PDB_UNREACHED:
+                return float(value)
         return np.inf
     
     def build(self):
@@ -49,7 +67,7 @@ class PatternDatabase:
         metadata = {
             'size': self.size,
             'dtype': str(self.pdb.dtype),
-            'version': '1.0',
+            'version': '1.2',  # 1.2: 4-bit entries (1.1 stored one uint8 each, 1.0 float32 with inf)
             'class_name': self.__class__.__name__
         }
         
@@ -66,12 +84,14 @@ class PatternDatabase:
         print(f"  Saved {file_size_mb:.1f} MB to {data_file}")
     
     @classmethod
-    def load(cls, filename: str):
+    def load(cls, filename: str, mmap: bool = True):
         """
         Load PDB from disk.
         
         Args:
             filename: base filename (will load .npy and .meta files)
+            mmap: memory-map the table read-only so only the pages that lookups
+                  touch are read (default True); False reads it all into RAM
         
         Returns:
             PatternDatabase instance with loaded data
@@ -88,15 +108,23 @@ class PatternDatabase:
         with open(meta_file, 'rb') as f:
             metadata = pickle.load(f)
         
-        # Load data (use memory mapping for large files to save RAM)
+        # Load data (memory mapping makes a warm start just an mmap() + header parse)
         file_size_mb = os.path.getsize(data_file) / (1024 * 1024)
-        if file_size_mb > 100:  # Use mmap for files > 100MB
+        if mmap:
             pdb_data = np.load(data_file, mmap_mode='r')
             print(f"  Loading {file_size_mb:.1f} MB (memory-mapped)")
         else:
             pdb_data = np.load(data_file)
             print(f"  Loaded {file_size_mb:.1f} MB")
         
+        # Version 1.0/1.1 caches hold one depth per element (float32 with inf, or uint8
+        # with 255 for unreached); pack them once in memory
+        if metadata.get('version', '1.0') in ('1.0', '1.1'):
+            print("  Packing legacy table to 4-bit entries (re-save to memory-map it)")
+            if pdb_data.dtype != np.uint8:
+                pdb_data = np.where(np.isinf(pdb_data), PDB_UNREACHED, pdb_data)
+            pdb_data = pack_nibbles(np.minimum(pdb_data, PDB_UNREACHED))
+        
         # Create instance without calling __init__ (to avoid allocating new array)
         instance = cls.__new__(cls)
         instance.size = metadata['size']
@@ -116,246 +144,31 @@ class PatternDatabase:
         return os.path.exists(filename + '.npy') and os.path.exists(filename + '.meta')
 
 
-class CornerOrientationPDB(PatternDatabase):
-    """
-    Corner Orientation Pattern Database.
-    
-    Abstracts state to (o_c(0), ..., o_c(6)) ∈ {0,1,2}^7
-    o_c(7) is determined by the constraint: sum ≡ 0 (mod 3)
-    """
-    
-    def __init__(self):
-        super().__init__(3**7)  # 2187 states
-    
-    def abstract(self, state: CubeState) -> int:
-        """
-        Extract corner orientation pattern and return index.
-        
-        index = sum_{i=0}^{6} o_c(i) * 3^i
-        """
-        # Optimized: avoid repeated exponentiation
-        index = 0
-        power = 1
-        for i in range(7):
-            index += int(state.corner_orient[i]) * power
-            power *= 3
-        return index
-    
-    def build(self):
-        """Build PDB using reverse BFS from solved state."""
-        print("Building Corner Orientation PDB...")
-        
-        # Initialize: solved state has index 0 and distance 0
-        self.pdb[0] = 0
-        
-        # BFS queue: (state, distance)
-        queue = deque([(solved_state(), 0)])
-        visited = set()
-        visited.add(0)
-        
-        depth = 0
-        nodes_at_depth = 1
-        
-        while queue:
-            state, dist = queue.popleft()
-            nodes_at_depth -= 1
-            
-            # Apply all moves
-            for move in ALL_MOVES:
-                next_state = move.apply(state)
-                abstract_index = self.abstract(next_state)
-                
-                # If we haven't seen this abstract state, add it
-                if abstract_index not in visited:
-                    visited.add(abstract_index)
-                    self.pdb[abstract_index] = dist + 1
-                    queue.append((next_state, dist + 1))
-            
-            if nodes_at_depth == 0:
-                depth += 1
-                nodes_at_depth = len(queue)
-                if depth % 2 == 0:
-                    print(f"  Depth {depth}: {len(visited)}/{self.size} states explored")
-        
-        print(f"Corner Orientation PDB built: {len(visited)}/{self.size} states")
-        print(f"  Max depth: {depth}")
-        print(f"  Coverage: {100 * len(visited) / self.size:.1f}%")
+# ============================================================================
+# Korf-style Pattern Databases
+# ============================================================================
 
+_FACTORIALS = [1, 1, 2, 6, 24, 120, 720, 5040, 40320, 362880, 3628800, 39916800, 479001600]
+_POPCOUNT_12 = [bin(i).count('1') for i in range(1 << 12)]  # set bits of every 12-bit mask
 
-class EdgeOrientationPDB(PatternDatabase):
-    """
-    Edge Orientation Pattern Database.
-    
-    Abstracts state to (o_e(0), ..., o_e(10)) ∈ {0,1}^11
-    o_e(11) is determined by the constraint: sum ≡ 0 (mod 2)
-    """
-    
-    def __init__(self):
-        super().__init__(2**11)  # 2048 states
-    
-    def abstract(self, state: CubeState) -> int:
-        """
-        Extract edge orientation pattern and return index.
-        
-        index = sum_{i=0}^{10} o_e(i) * 2^i
-        """
-        # Optimized: use bit shifting instead of exponentiation
-        index = 0
-        for i in range(11):
-            if state.edge_orient[i]:
-                index |= (1 << i)
-        return index
-    
-    def build(self):
-        """Build PDB using reverse BFS from solved state."""
-        print("Building Edge Orientation PDB...")
-        
-        # Initialize: solved state has index 0 and distance 0
-        self.pdb[0] = 0
-        
-        # BFS queue: (state, distance)
-        queue = deque([(solved_state(), 0)])
-        visited = set()
-        visited.add(0)
-        
-        depth = 0
-        nodes_at_depth = 1
-        
-        while queue:
-            state, dist = queue.popleft()
-            nodes_at_depth -= 1
-            
-            # Apply all moves
-            for move in ALL_MOVES:
-                next_state = move.apply(state)
-                abstract_index = self.abstract(next_state)
-                
-                # If we haven't seen this abstract state, add it
-                if abstract_index not in visited:
-                    visited.add(abstract_index)
-                    self.pdb[abstract_index] = dist + 1
-                    queue.append((next_state, dist + 1))
-            
-            if nodes_at_depth == 0:
-                depth += 1
-                nodes_at_depth = len(queue)
-                if depth % 2 == 0:
-                    print(f"  Depth {depth}: {len(visited)}/{self.size} states explored")
-        
-        print(f"Edge Orientation PDB built: {len(visited)}/{self.size} states")
-        print(f"  Max depth: {depth}")
-        print(f"  Coverage: {100 * len(visited) / self.size:.1f}%")
 
-
-class CornerPermutationPDB(PatternDatabase):
+def lehmer_encode(perm):
     """
-    Corner Permutation Pattern Database.
+    Encode permutation using Lehmer code (factorial number system).
     
-    Abstracts state to corner permutation p_c ∈ S_8
-    Encoded using factorial number system (Lehmer code)
+    Linear time: the number of smaller values right of perm[i] is perm[i] minus
+    the smaller values already seen on its left, counted on a bitmask of seen values
+    (permutations of up to 12 elements).
     """
-    
-    def __init__(self):
-        super().__init__(40320)  # 8! = 40320 states
-    
-    def abstract(self, state: CubeState) -> int:
-        """
-        Extract corner permutation and return index using Lehmer code.
-        
-        The Lehmer code encodes a permutation as a sequence of numbers
-        representing how many elements to the right are smaller.
-        Optimized: avoid copying array, use direct access.
-        """
-        perm = state.corner_perm  # No need to copy
-        index = 0
-        factorial = 1
-        
-        for i in range(7, 0, -1):
-            # Count elements to the right that are smaller
-            count = 0
-            val_i = perm[i]
-            for j in range(i + 1, 8):
-                if perm[j] < val_i:
-                    count += 1
-            index += count * factorial
-            factorial *= (8 - i)
-        
-        return index
-    
-    def build(self):
-        """Build PDB using reverse BFS from solved state."""
-        print("Building Corner Permutation PDB...")
-        
-        # Initialize: solved state has index 0 and distance 0
-        self.pdb[0] = 0
-        
-        # BFS queue: (state, distance)
-        queue = deque([(solved_state(), 0)])
-        visited = set()
-        visited.add(0)
-        
-        depth = 0
-        nodes_at_depth = 1
-        
-        while queue:
-            state, dist = queue.popleft()
-            nodes_at_depth -= 1
-            
-            # Apply all moves
-            for move in ALL_MOVES:
-                next_state = move.apply(state)
-                abstract_index = self.abstract(next_state)
-                
-                # If we haven't seen this abstract state, add it
-                if abstract_index not in visited:
-                    visited.add(abstract_index)
-                    self.pdb[abstract_index] = dist + 1
-                    queue.append((next_state, dist + 1))
-            
-            if nodes_at_depth == 0:
-                depth += 1
-                nodes_at_depth = len(queue)
-                if depth % 3 == 0:
-                    print(f"  Depth {depth}: {len(visited)}/{self.size} states explored")
-        
-        print(f"Corner Permutation PDB built: {len(visited)}/{self.size} states")
-        print(f"  Max depth: {depth}")
-        print(f"  Coverage: {100 * len(visited) / self.size:.1f}%")
-
-
-def build_all_pdbs():
-    """Build all pattern databases."""
-    co_pdb = CornerOrientationPDB()
-    co_pdb.build()
-    
-    eo_pdb = EdgeOrientationPDB()
-    eo_pdb.build()
-    
-    cp_pdb = CornerPermutationPDB()
-    cp_pdb.build()
-    
-    return co_pdb, eo_pdb, cp_pdb
-
-
-# ============================================================================
-# Korf-style Pattern Databases
-# ============================================================================
-
-def lehmer_encode(perm):
-    """Encode permutation using Lehmer code (factorial number system)."""
     n = len(perm)
     index = 0
-    factorial = 1
+    seen = 0
     
-    # Process from right to left (positions n-1 down to 0)
-    for i in range(n - 1, -1, -1):
-        count = 0
+    for i in range(n):
         val_i = perm[i]
-        for j in range(i + 1, n):
-            if perm[j] < val_i:
-                count += 1
-        index += count * factorial
-        factorial *= (n - i)
+        count = val_i - _POPCOUNT_12[seen & ((1 << val_i) - 1)]
+        index += count * _FACTORIALS[n - 1 - i]
+        seen |= 1 << val_i
     
     return index
 
@@ -391,6 +204,22 @@ def encode_corner_orient(orient):
     return index
 
 
+def lehmer_encode_batch(perms: np.ndarray) -> np.ndarray:
+    """
+    Lehmer-encode every row of an (N, n) array of permutations at once.
+    
+    Digit i counts the entries right of perms[:, i] that are smaller than it.
+    """
+    n = perms.shape[1]
+    smaller_right = np.triu(perms[:, None, :] < perms[:, :, None], k=1)
+    digits = smaller_right.sum(axis=2)
+    return digits @ np.array(_FACTORIALS[n - 1::-1], dtype=np.int64)
+
+
+# Base-3 place values of the 7 free corner orientations
+_CORNER_ORIENT_WEIGHTS = 3 ** np.arange(7, dtype=np.int64)
+
+
 def decode_corner_orient(index):
     """Decode corner orientation from index."""
     orient = [0] * 8
@@ -402,6 +231,36 @@ def decode_corner_orient(index):
     return orient
 
 
+def _build_corner_full_abstract():
+    """
+    Generate CornerFullPDB.abstract() as straight-line Python.
+    
+    Lehmer digit i is perm[i] minus the smaller values left of it, so the 8 digits
+    are unrolled comparisons with the factorial weights and base-3 place values
+    folded to literals.
+    
+    Returns:
+        function(state) -> perm_index * 2187 + orient_index
+    """
+    terms = []
+    for i in range(8):
+        smaller_left = ''.join(f' - (p{j} < p{i})' for j in range(i))
+        terms.append(f'(p{i}{smaller_left}) * {_FACTORIALS[7 - i]}')
+    orient = ' + '.join(f'd[{8 + i}] * {3 ** i}' for i in range(7))
+    lines = [
+        'def _corner_full_abstract(state):',
+        '    d = state._data.tolist()',
+        '    ' + ', '.join(f'p{i}' for i in range(8)) + ' = d[0:8]',
+        '    return (' + ' + '.join(terms) + f') * 2187 + {orient}',
+    ]
+    namespace = {}
+    exec('\n'.join(lines), namespace)
+    return namespace['_corner_full_abstract']
+
+
+_corner_full_abstract = _build_corner_full_abstract()
+
+
 class CornerFullPDB(PatternDatabase):
     """
     Korf-style Full Corner Pattern Database.
@@ -424,8 +283,12 @@ class CornerFullPDB(PatternDatabase):
         
         Index = perm_index * 2187 + orient_index
         """
-        perm_index = lehmer_encode(state.corner_perm)
-        orient_index = encode_corner_orient(state.corner_orient)
+        return _corner_full_abstract(state)
+    
+    def abstract_batch(self, states: np.ndarray) -> np.ndarray:
+        """Vectorized abstract() over an (N, 40) array of CubeState buffers."""
+        perm_index = lehmer_encode_batch(states[:, 0:8])
+        orient_index = states[:, 8:15] @ _CORNER_ORIENT_WEIGHTS
         return perm_index * self.ORIENT_SIZE + orient_index
     
     def apply_move_to_abstract(self, abstract_index: int, move) -> int:
@@ -481,9 +344,12 @@ class CornerFullPDB(PatternDatabase):
         print("Building Corner Full PDB (Korf-style)...")
         print(f"  Total states: {self.size:,}")
         
+        # Depths are filled one byte per entry during BFS and packed at the end
+        depths = np.full(self.size, PDB_UNREACHED, dtype=np.uint8)
+        
         # Initialize: solved state has index 0 and distance 0
         solved_index = self.abstract(solved_state())
-        self.pdb[solved_index] = 0
+        depths[solved_index] = 0
         
         # BFS queue: (abstract_index, distance)
         queue = deque([(solved_index, 0)])
@@ -514,7 +380,7 @@ class CornerFullPDB(PatternDatabase):
                 if not visited[next_index]:
                     visited[next_index] = True
                     visited_count += 1
-                    self.pdb[next_index] = dist + 1
+                    depths[next_index] = dist + 1
                     queue.append((next_index, dist + 1))
             
             if nodes_at_depth == 0:
@@ -526,6 +392,7 @@ class CornerFullPDB(PatternDatabase):
         print(f"Corner Full PDB built: {visited_count:,}/{self.size:,} states")
         print(f"  Max depth: {depth}")
         print(f"  Coverage: {100 * visited_count / self.size:.2f}%")
+        self.pdb = pack_nibbles(depths)
         
         # Save to cache if requested
         if cache_file:
@@ -610,8 +477,9 @@ def encode_edge6_pattern(state, tracked_positions):
     Optimized version using reusable temp buffers to avoid allocations.
     """
     # Get the 6 edge cubies in tracked positions (reuse temp buffer)
+    edge_perm = state.edge_perm.tolist()
     for i, pos in enumerate(tracked_positions):
-        _TEMP_TRACKED_CUBIES[i] = state.edge_perm[pos]
+        _TEMP_TRACKED_CUBIES[i] = edge_perm[pos]
     
     # Sort to get canonical "which edges" representation (in-place sort of copy)
     _TEMP_SORTED_CUBIES[:] = _TEMP_TRACKED_CUBIES[:]
@@ -636,13 +504,66 @@ def encode_edge6_pattern(state, tracked_positions):
     
     # Encode orientations (6 bits) - compute directly without list
     orient_index = 0
+    edge_orient = state.edge_orient.tolist()
     for i, pos in enumerate(tracked_positions):
-        if state.edge_orient[pos]:
+        if edge_orient[pos]:
             orient_index |= (1 << i)
     
     return which_edges_index, perm_index, orient_index
 
 
+def _build_edge6_which_index():
+    """combination_index() of every 6-of-12 cubie set, keyed by its 12-bit mask."""
+    table = np.zeros(1 << 12, dtype=np.int64)
+    for mask in range(1 << 12):
+        if _POPCOUNT_12[mask] == 6:
+            table[mask] = combination_index([i for i in range(12) if mask >> i & 1], 12, 6)
+    return table
+
+
+_EDGE6_WHICH_INDEX = _build_edge6_which_index()
+_EDGE6_ORIENT_WEIGHTS = 1 << np.arange(6, dtype=np.int64)
+_EDGE6_WHICH_INDEX_LIST = _EDGE6_WHICH_INDEX.tolist()
+_EDGE6_ABSTRACTS = {}
+
+
+def compile_edge6_abstract(tracked_positions):
+    """
+    Generate Edge6PDB.abstract() for one set of tracked positions as straight-line Python.
+    
+    Same index as encode_edge6_pattern(), with the positions folded to literals:
+    the which-edges rank comes from a 12-bit mask table, each cubie's rank among the
+    six is a popcount of the smaller mask bits, and the Lehmer digits are unrolled
+    comparisons of those ranks. Functions are cached per position tuple.
+    
+    Returns:
+        function(d) -> (which_edges * 720 + perm_index) * 64 + orient_index, where d is
+        the state's buffer as a list (state._data.tolist() or a Move.apply_fast() result)
+    """
+    key = tuple(tracked_positions)
+    fn = _EDGE6_ABSTRACTS.get(key)
+    if fn is not None:
+        return fn
+    
+    lines = ['def _edge6_abstract(d):']
+    for i, pos in enumerate(key):
+        lines.append(f'    c{i} = d[{16 + pos}]')
+    lines.append('    m = ' + ' | '.join(f'(1 << c{i})' for i in range(6)))
+    for i in range(6):
+        lines.append(f'    r{i} = POP[m & ((1 << c{i}) - 1)]')
+    terms = []
+    for i in range(6):
+        smaller_left = ''.join(f' - (r{j} < r{i})' for j in range(i))
+        terms.append(f'(r{i}{smaller_left}) * {_FACTORIALS[5 - i]}')
+    orient = ' | '.join(f'(d[{28 + pos}] << {i})' for i, pos in enumerate(key))
+    lines.append('    return (WHICH[m] * 720 + ' + ' + '.join(terms) + f') * 64 + ({orient})')
+    
+    namespace = {'POP': _POPCOUNT_12, 'WHICH': _EDGE6_WHICH_INDEX_LIST}
+    exec('\n'.join(lines), namespace)
+    fn = _EDGE6_ABSTRACTS[key] = namespace['_edge6_abstract']
+    return fn
+
+
 class Edge6PDB(PatternDatabase):
     """
     Korf-style 6-Edge Pattern Database.
@@ -674,15 +595,34 @@ class Edge6PDB(PatternDatabase):
             super().__init__(estimated_size)
         self.tracked_positions = tracked_positions
         self.name = name
+        self._abstract = compile_edge6_abstract(tracked_positions)
+    
+    @classmethod
+    def load(cls, filename: str, mmap: bool = True):
+        """Load PDB from disk (see PatternDatabase.load) and specialize abstract() to its positions."""
+        instance = super().load(filename, mmap=mmap)
+        instance._abstract = compile_edge6_abstract(instance.tracked_positions)
+        return instance
     
     def abstract(self, state: CubeState) -> int:
-        """Extract 6-edge pattern and return index."""
-        which_edges, perm_idx, orient_idx = encode_edge6_pattern(state, self.tracked_positions)
-        # Simple encoding (may need refinement)
-        index = which_edges * self.PERM_SIZE * self.ORIENT_SIZE
-        index += perm_idx * self.ORIENT_SIZE
-        index += orient_idx
-        return index
+        """
+        Extract 6-edge pattern and return index.
+        
+        index = (which_edges * 720 + perm_idx) * 64 + orient_idx, as encoded by
+        encode_edge6_pattern(), via the function generated for tracked_positions.
+        """
+        return self._abstract(state._data.tolist())
+    
+    def abstract_batch(self, states: np.ndarray) -> np.ndarray:
+        """Vectorized abstract() over an (N, 40) array of CubeState buffers."""
+        positions = np.asarray(self.tracked_positions)
+        tracked = states[:, 16 + positions].astype(np.int64)
+        which_edges = _EDGE6_WHICH_INDEX[(1 << tracked).sum(axis=1)]
+        # Rank of each tracked cubie among the six, then the Lehmer code of those ranks
+        perm_in_sorted = (tracked[:, None, :] < tracked[:, :, None]).sum(axis=2)
+        perm_idx = lehmer_encode_batch(perm_in_sorted)
+        orient_idx = states[:, 28 + positions] @ _EDGE6_ORIENT_WEIGHTS
+        return (which_edges * self.PERM_SIZE + perm_idx) * self.ORIENT_SIZE + orient_idx
     
     def build(self, cache_file: str = None):
         """
@@ -706,14 +646,18 @@ class Edge6PDB(PatternDatabase):
         print(f"  Tracked positions: {self.tracked_positions}")
         print(f"  Estimated states: {self.size:,}")
         
+        # Depths are filled one byte per entry during BFS and packed at the end
+        depths = np.full(self.size, PDB_UNREACHED, dtype=np.uint8)
+        
         # Initialize: solved state
         solved_state_obj = solved_state()
         solved_index = self.abstract(solved_state_obj)
         if solved_index < self.size:
-            self.pdb[solved_index] = 0
+            depths[solved_index] = 0
         
-        # BFS queue: store states (decoding Edge6PDB abstract index is complex)
-        queue = deque([(solved_state_obj, 0)])
+        # BFS queue: store states (decoding Edge6PDB abstract index is complex) packed as
+        # 40-byte to_bytes() keys, which take a fraction of the memory of CubeState objects
+        queue = deque([(solved_state_obj.to_bytes(), 0)])
         # Optimization #4: Use NumPy boolean array instead of Python set
         visited = np.zeros(self.size, dtype=np.bool_)
         if solved_index < self.size:
@@ -725,11 +669,14 @@ class Edge6PDB(PatternDatabase):
         states_processed = 0
         last_print_count = 0
         
-        # Optimization #2: Reusable working state for in-place operations
-        working_state = CubeState()
+        # Successors are generated by the moves' specialized list functions, and the
+        # abstraction reads those lists directly, so no CubeState is built per node
+        apply_moves = [move.apply_fast for move in ALL_MOVES]
+        abstract = self._abstract
         
         while queue:
-            state, dist = queue.popleft()
+            key, dist = queue.popleft()
+            data = list(key)
             nodes_at_depth -= 1
             states_processed += 1
             
@@ -738,28 +685,16 @@ class Edge6PDB(PatternDatabase):
                 print(f"  [PROGRESS] Processed {states_processed:,} states ({visited_count:,} unique, {100*visited_count/self.size:.2f}% coverage)", flush=True)
                 last_print_count = states_processed
             
-            # Optimization #2: Use in-place operations - copy state once, apply moves in-place
-            # Copy state to working_state
-            working_state.corner_perm = state.corner_perm[:]
-            working_state.corner_orient = state.corner_orient[:]
-            working_state.edge_perm = state.edge_perm[:]
-            working_state.edge_orient = state.edge_orient[:]
-            
-            # Apply all moves in-place
-            for move in ALL_MOVES:
-                move.apply_in_place(working_state)
-                abstract_index = self.abstract(working_state)
+            for apply_move in apply_moves:
+                child = apply_move(data)
+                abstract_index = abstract(child)
                 
                 if abstract_index < self.size and not visited[abstract_index]:
                     visited[abstract_index] = True
                     visited_count += 1
-                    self.pdb[abstract_index] = dist + 1
-                    # Only copy when adding to queue
-                    queue.append((working_state.copy(), dist + 1))
-                
-                # Undo move to reuse working_state
-                inverse_move = MOVE_INVERSE_TABLE[move]
-                inverse_move.apply_in_place(working_state)
+                    depths[abstract_index] = dist + 1
+                    # Only pack when adding to queue
+                    queue.append((bytes(child), dist + 1))
             
             if nodes_at_depth == 0:
                 depth += 1
@@ -811,17 +746,48 @@ class Edge6PDB(PatternDatabase):
             
             # Let me implement a simpler version that still gives good speedup
         
+        self.pdb = pack_nibbles(depths)
+        
         # Save to cache if requested
         if cache_file:
             self.save(cache_file)
 
 
-def build_korf_pdbs(cache_dir: str = "pdb_cache"):
+# PDB class and constructor arguments stored under each Korf cache name,
+# in build_korf_pdbs return order
+_KORF_PDBS = {
+    "corner_full": (CornerFullPDB, ()),
+    "edge6a": (Edge6PDB, (EDGE_SET_1_POSITIONS, "Edge6A")),
+    "edge6b": (Edge6PDB, (EDGE_SET_2_POSITIONS, "Edge6B")),
+}
+
+# Cache file names of the three Korf PDBs, in build_korf_pdbs return order
+KORF_PDB_NAMES = tuple(_KORF_PDBS)
+
+
+def _korf_pdb(name: str) -> PatternDatabase:
+    """Create the (unbuilt) Korf PDB stored under the given cache name."""
+    cls, args = _KORF_PDBS[name]
+    return cls(*args)
+
+
+def _build_cached_pdb(name: str, cache_dir: str) -> str:
+    """Worker entry point: build one Korf PDB and save it under cache_dir."""
+    _korf_pdb(name).build(cache_file=os.path.join(cache_dir, name))
+    return name
+
+
+def build_korf_pdbs(cache_dir: str = "pdb_cache", parallel: bool = True):
     """
     Build Korf-style pattern databases.
     
+    The three BFS builds are independent, so when more than one PDB is missing
+    from the cache they are built in separate processes and then loaded back
+    from the cache files.
+    
     Args:
         cache_dir: Directory to store/load cached PDB files
+        parallel: Build missing PDBs concurrently (requires cache_dir)
     
     Returns:
         Tuple of (corner_pdb, edge6a_pdb, edge6b_pdb)
@@ -833,22 +799,29 @@ def build_korf_pdbs(cache_dir: str = "pdb_cache"):
     print("Building/loading Korf-style pattern databases...")
     print()
     
-    # Build or load corner PDB
-    corner_cache = os.path.join(cache_dir, "corner_full") if cache_dir else None
-    corner_pdb = CornerFullPDB()
-    corner_pdb.build(cache_file=corner_cache)
-    print()
-    
-    # Build or load edge6a PDB
-    edge6a_cache = os.path.join(cache_dir, "edge6a") if cache_dir else None
-    edge6a_pdb = Edge6PDB(EDGE_SET_1_POSITIONS, "Edge6A")
-    edge6a_pdb.build(cache_file=edge6a_cache)
-    print()
-    
-    # Build or load edge6b PDB
-    edge6b_cache = os.path.join(cache_dir, "edge6b") if cache_dir else None
-    edge6b_pdb = Edge6PDB(EDGE_SET_2_POSITIONS, "Edge6B")
-    edge6b_pdb.build(cache_file=edge6b_cache)
+    if cache_dir and parallel:
+        missing = [name for name in KORF_PDB_NAMES
+                   if not PatternDatabase.exists(os.path.join(cache_dir, name))]
+        if len(missing) > 1:
+            print(f"Building {len(missing)} PDBs in parallel: {', '.join(missing)}")
+            with ProcessPoolExecutor(max_workers=len(missing)) as pool:
+                for name in pool.map(_build_cached_pdb, missing, [cache_dir] * len(missing)):
+                    print(f"  {name} PDB built")
+            print()
+    
+    # Build or load each PDB (anything built above now loads from the cache)
+    pdbs = []
+    for name in KORF_PDB_NAMES:
+        cache_file = os.path.join(cache_dir, name) if cache_dir else None
+        if cache_file and PatternDatabase.exists(cache_file):
+            # Map the cached table directly instead of allocating an empty one first
+            print(f"Loading {name} PDB from cache: {cache_file}")
+            pdb = _KORF_PDBS[name][0].load(cache_file)
+        else:
+            pdb = _korf_pdb(name)
+            pdb.build(cache_file=cache_file)
+        pdbs.append(pdb)
+        print()
     
+    corner_pdb, edge6a_pdb, edge6b_pdb = pdbs
     return corner_pdb, edge6a_pdb, edge6b_pdb
-
@@ -2,36 +2,66 @@
 Search algorithm: IDA*
 """
 
+import time
+import numpy as np
 from cube_state import CubeState
-from moves import ALL_MOVES, MOVE_INVERSES, MOVE_INVERSE_TABLE, MOVE_TO_FACE, FACE_TO_MOVES
-from heuristics import Heuristic
+from moves import NEXT_MOVES, expand_all, next_moves_table
+from heuristics import Heuristic, get_heuristic
 
 
 FAIL = object()
 
+# Transposition table: fixed number of slots, indexed by hash(state.coord()) & TT_MASK
+TT_SIZE = 1 << 20
+TT_MASK = TT_SIZE - 1
+TT_EMPTY = 127  # Depth stored in unused slots (deeper than any search)
+
+# Nodes expanded between deadline checks (must be a power of two)
+DEADLINE_CHECK_INTERVAL = 1 << 12
+
+
+class SearchTimeout(Exception):
+    """Raised by IDAStar.solve() when its time_limit runs out."""
+
 
 class IDAStar:
     """IDA* algorithm with pattern database heuristics."""
     
-    def __init__(self, heuristic: Heuristic = None, optimal: bool = True):
+    def __init__(self, heuristic: Heuristic = None, optimal: bool = True, canonical: bool = True):
         """
         Initialize IDA* solver.
         
         Args:
-            heuristic: Heuristic object (will be created if None)
+            heuristic: Heuristic object (shared get_heuristic() instance if None)
             optimal: If True, explores all paths at threshold before returning (guarantees optimality).
                      If False, returns first solution found (faster but may be suboptimal).
+            canonical: If True, moves on opposite faces are only searched in one order
+                       (U D but not D U), which keeps admissibility and cuts the branching factor.
         """
         if heuristic is None:
-            self.heuristic = Heuristic()
+            self.heuristic = get_heuristic()
         else:
             self.heuristic = heuristic
         
         self.optimal = optimal
+        self.canonical = canonical
+        # Moves to try after each previous move; same-face and (if canonical)
+        # reversed opposite-face pairs are pruned here rather than per node
+        self._next_moves = NEXT_MOVES if canonical else next_moves_table(canonical=False)
+        # Heuristics with h_batch() score all successors of a node in one vectorized call
+        self._h_batch = getattr(self.heuristic, 'h_batch', None)
         self.nodes_expanded = 0
         self.max_depth_reached = 0
+        self._deadline = None
+        
+        # Transposition table: per slot, the state.coord() key and smallest g it was
+        # expanded at this iteration (a colliding state only takes the slot if it is
+        # at least as close to the root)
+        self.tt_keys = [None] * TT_SIZE
+        self.tt_depth = np.full(TT_SIZE, TT_EMPTY, dtype=np.int8)
     
-    def solve(self, initial_state: CubeState, max_iterations: int = 50, verbose: bool = True):
+    def solve(self, initial_state: CubeState, max_iterations: int = 50, verbose: bool = True,
+              time_limit: float = None):
         """
         Solve using IDA*.
         
@@ -39,12 +69,17 @@ class IDAStar:
             initial_state: starting cube state
             max_iterations: maximum number of iterations (default 50)
             verbose: whether to print progress messages (default True)
+            time_limit: seconds before giving up with SearchTimeout (default None, no limit)
         
         Returns:
             List of move names representing the solution, or None if not found
+        
+        Raises:
+            SearchTimeout: if time_limit is set and the search runs past it
         """
         self.nodes_expanded = 0
         self.max_depth_reached = 0
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
         
         # Initial threshold
         h0 = self.heuristic.h(initial_state)
@@ -54,6 +89,10 @@ class IDAStar:
         max_depth = 50  # Reasonable upper bound
         path = [None] * max_depth
         
+        # One preallocated state per depth: children are expanded into stack[depth + 1],
+        # so the DFS allocates no states and never has to undo a move
+        self._stack = [CubeState() for _ in range(max_depth + 1)]
+        
         if verbose:
             print(f"Initial heuristic value: {h0:.1f}")
             print(f"Starting IDA* search...")
@@ -62,15 +101,16 @@ class IDAStar:
             if verbose:
                 print(f"Iteration {iteration + 1}: threshold = {threshold:.1f}")
             
-            # Create a working copy of the state for this iteration
-            working_state = initial_state.copy()
+            # g-costs are only comparable under the same threshold
+            self.tt_keys = [None] * TT_SIZE
+            self.tt_depth.fill(TT_EMPTY)
             
             # Clear path buffer for this iteration (important for correctness)
             # Path is reused across iterations, so we need to ensure old values don't interfere
             # Since we start with path_len=0, we don't need to clear, but let's be safe
             # Actually, we don't need to clear since path_len=0 means we only read path[0:path_len]
             
-            result, next_threshold = self._search(working_state, 0.0, threshold, None, path, 0)
+            result, next_threshold = self._search(initial_state, 0.0, threshold, None, path, 0)
             
             if isinstance(result, list):
                 if verbose:
@@ -89,10 +129,12 @@ class IDAStar:
         return None
     
     def _search(self, state: CubeState, g: float, threshold: float,
-               last_move_name: str, path: list, path_len: int):
+               last_move_name: str, path: list, path_len: int, h: float = None):
         """
         Recursive IDA* search.
         
+        h is the state's heuristic value if the parent already computed it.
+        
         Returns:
             (result, next_threshold) where:
             - result is either a solution path (list) or FAIL
@@ -100,8 +142,12 @@ class IDAStar:
         """
         self.nodes_expanded += 1
         self.max_depth_reached = max(self.max_depth_reached, path_len)
+        if (self._deadline is not None and not self.nodes_expanded & (DEADLINE_CHECK_INTERVAL - 1)
+                and time.perf_counter() > self._deadline):
+            raise SearchTimeout(f"Search stopped after {self.nodes_expanded} nodes")
         
-        h = self.heuristic.h(state)
+        if h is None:
+            h = self.heuristic.h(state)
         f = g + h
         
         # Bound check
@@ -113,37 +159,40 @@ class IDAStar:
             # Return path up to current depth (Fix #4)
             return path[:path_len], threshold
         
+        # Transposition check: a state already expanded at depth <= g this iteration
+        # had at least as much budget left, so its subtree has nothing new to offer
+        key = state.coord()
+        slot = hash(key) & TT_MASK
+        tt_depth = self.tt_depth
+        if self.tt_keys[slot] == key and tt_depth[slot] <= g:
+            return FAIL, float('inf')
+        if g <= tt_depth[slot]:
+            self.tt_keys[slot] = key
+            tt_depth[slot] = g
+        
+        child = self._stack[path_len + 1]
+        if self._h_batch is not None:
+            children = expand_all(state)
+            children_h = self._h_batch(children).tolist()
+        else:
+            children = None
         min_overflow = float('inf')
         best_solution = None  # Track best solution at this threshold (for optimal mode)
         
-        # Get face of last move for face-axis pruning
-        last_face = None
-        if last_move_name:
-            last_face = MOVE_TO_FACE.get(last_move_name)
-        
-        for move in ALL_MOVES:
-            # Prune immediate inverse
-            if last_move_name and move.name == MOVE_INVERSES.get(last_move_name):
-                continue
-            
-            # Face-axis pruning: skip moves on the same face as last move
-            if last_face:
-                move_face = MOVE_TO_FACE.get(move.name)
-                if move_face == last_face:
-                    continue
-            
-            # Apply move in-place (Fix #2)
-            move.apply_in_place(state)
+        for k, move in self._next_moves[last_move_name]:
+            # Expand into this depth's preallocated child state
+            if children is not None:
+                child._data[:] = children[k]
+                child_h = children_h[k]
+            else:
+                move.apply_into(state, child)
+                child_h = None
             path[path_len] = move.name  # Fix #4 - no list concatenation
             
             result, next_threshold = self._search(
-                state, g + 1, threshold, move.name, path, path_len + 1
+                child, g + 1, threshold, move.name, path, path_len + 1, child_h
             )
             
-            # Undo move (Fix #2)
-            inverse_move = MOVE_INVERSE_TABLE[move]
-            inverse_move.apply_in_place(state)
-            
             if isinstance(result, list):
                 if self.optimal:
                     # Optimal mode: continue searching to find the shortest solution
@@ -2,9 +2,10 @@
 Basic tests to verify the cube solver implementation.
 """
 
+import numpy as np
 from cube_state import CubeState, solved_state
 from moves import MOVE_TABLE, ALL_MOVES
-from utils import apply_moves, verify_solution
+from utils import apply_moves, compose_moves, verify_solution
 
 
 def test_solved_state():
@@ -52,9 +53,149 @@ def test_scramble_solve():
     # Solution should be R' U'
     solution = ["R'", "U'"]
     assert verify_solution(scrambled, solution), "Solution should work"
+    
+    # A composed scramble should match applying the moves one by one
+    long_scramble = "R U2 F' L D B2 R' F U' D2 L' B".split()
+    composed = compose_moves(long_scramble).apply(state)
+    assert composed == apply_moves(state, long_scramble), "Composed scramble should match"
     print("✓ Scramble-solve test passed")
 
 
+def test_converter_roundtrip():
+    """Test that face colors and the cubie model convert back and forth."""
+    from cube_converter import (cubie_state_to_faces, faces_to_cubie_state, faces_batch_to_cubie_states,
+                                faces_to_cubie_state_into, faces_to_coord, coord_to_state)
+    
+    states = []
+    for scramble_moves in [[], ['R'], ['F', "U'"], ['R', 'U', "R'", "U'", 'F2', 'B', "L'", 'D2']]:
+        state = apply_moves(solved_state(), scramble_moves)
+        faces = cubie_state_to_faces(state)
+        assert faces_to_cubie_state(faces) == state, f"Round trip failed for {scramble_moves}"
+        assert faces_to_cubie_state(faces.astype(float)) == state, "Float faces should convert"
+        assert CubeState.unpack(state.pack()) == state, f"Pack round trip failed for {scramble_moves}"
+        assert (cubie_state_to_faces(state.pack()) == faces).all()
+        coord = faces_to_coord(faces)
+        assert coord_to_state(coord) == state, f"Coordinate round trip failed for {scramble_moves}"
+        assert (cubie_state_to_faces(coord) == faces).all()
+        out = np.zeros((6, 3, 3), dtype=np.int8)
+        assert cubie_state_to_faces(state, out=out) is out and (out == faces).all()
+        states.append(state)
+    
+    # Unsolvable faces are only rejected when asked to validate
+    faces = cubie_state_to_faces(solved_state())
+    twisted = faces.copy()
+    twisted[0, 2, 2], twisted[2, 0, 2], twisted[3, 0, 0] = faces[2, 0, 2], faces[3, 0, 0], faces[0, 2, 2]
+    assert faces_to_cubie_state(twisted) is not None
+    assert faces_to_cubie_state(twisted, validate=True) is None
+    assert faces_to_cubie_state(faces, validate=True) == solved_state()
+    
+    # Batch conversion gives the same states
+    batch = np.stack([cubie_state_to_faces(state) for state in states])
+    cp, co, ep, eo = faces_batch_to_cubie_states(batch)
+    for i, state in enumerate(states):
+        assert CubeState(cp[i].tolist(), co[i].tolist(), ep[i].tolist(), eo[i].tolist()) == state
+    
+    # Converting into preallocated buffers fills the same values
+    corners = np.zeros((len(states), 2, 8), dtype=np.int8)
+    edges = np.zeros((len(states), 2, 12), dtype=np.int8)
+    for i in range(len(states)):
+        assert faces_to_cubie_state_into(batch[i], corners[i, 0], corners[i, 1], edges[i, 0], edges[i, 1])
+    assert (corners[:, 0] == cp).all() and (corners[:, 1] == co).all()
+    assert (edges[:, 0] == ep).all() and (edges[:, 1] == eo).all()
+    print("✓ Converter round-trip test passed")
+
+
+def test_pdb_packed_storage():
+    """Test 4-bit PDB packing and loading of legacy one-entry-per-element caches."""
+    import os, pickle, tempfile
+    from pattern_databases import PatternDatabase, pack_nibbles, PDB_UNREACHED
+    
+    for depths in ([0, 3, PDB_UNREACHED, 11], [7, PDB_UNREACHED, 1, 0, 10]):
+        pdb = PatternDatabase(len(depths))
+        pdb.pdb = pack_nibbles(depths)
+        assert len(pdb.pdb) == (len(depths) + 1) // 2
+        expected = [np.inf if d == PDB_UNREACHED else float(d) for d in depths]
+        assert [pdb.get(i) for i in range(len(depths))] == expected, f"Packing failed for {depths}"
+        assert pdb.get(len(depths)) == np.inf
+    
+    # Version 1.0 (float32, inf) and 1.1 (uint8, 255) tables are packed on load
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for version, legacy in (('1.0', np.array([0, 4, np.inf, 9, 1], dtype=np.float32)),
+                                ('1.1', np.array([0, 4, 255, 9, 1], dtype=np.uint8))):
+            filename = os.path.join(cache_dir, 'legacy_' + version)
+            np.save(filename + '.npy', legacy)
+            with open(filename + '.meta', 'wb') as f:
+                pickle.dump({'size': 5, 'dtype': str(legacy.dtype), 'version': version,
+                             'class_name': 'PatternDatabase'}, f)
+            loaded = PatternDatabase.load(filename)
+            assert loaded.pdb.dtype == np.uint8 and len(loaded.pdb) == 3
+            assert loaded.pdb[1] & 0xF == PDB_UNREACHED
+            assert [loaded.get(i) for i in range(5)] == [0.0, 4.0, np.inf, 9.0, 1.0]
+    print("✓ PDB packed storage test passed")
+
+
+def test_h_batch_matches_h():
+    """Test that vectorized h_batch() agrees with h() on every successor."""
+    from heuristics import Heuristic
+    from moves import expand_all
+    from pattern_databases import CornerFullPDB, Edge6PDB, EDGE_SET_1_POSITIONS, EDGE_SET_2_POSITIONS
+    
+    # Random packed tables (including unreached 0xF nibbles) instead of the built PDBs
+    rng = np.random.default_rng(0)
+    pdbs = [CornerFullPDB(), Edge6PDB(EDGE_SET_1_POSITIONS, "Edge6A"), Edge6PDB(EDGE_SET_2_POSITIONS, "Edge6B")]
+    for pdb in pdbs:
+        pdb.pdb = rng.integers(0, 256, (pdb.size + 1) // 2, dtype=np.uint8)
+    heuristic = Heuristic(*pdbs)
+    
+    for scramble_moves in [[], ['R'], ['F', "U'", 'L2'], "R U2 F' L D B2 R' F U' D2 L' B".split()]:
+        state = apply_moves(solved_state(), scramble_moves)
+        children = expand_all(state)
+        expected = [heuristic.h(CubeState.from_bytes(child.tobytes())) for child in children]
+        assert heuristic.h_batch(children).tolist() == expected, f"h_batch mismatch for {scramble_moves}"
+    print("✓ h_batch test passed")
+
+
+def test_search_pruning_keeps_optimal_length():
+    """Test that canonical move pruning and the transposition table keep solutions optimal."""
+    from search import IDAStar
+    
+    class ZeroHeuristic:
+        """Trivially admissible heuristic, so IDA* explores every depth in full."""
+        def h(self, state):
+            return 0.0
+    
+    for scramble_moves, optimal_length in [(['R'], 1), (['U', 'R'], 2), (['R', 'L'], 2),
+                                           (['U', 'D', 'U'], 2), (['F', "U'", 'L2'], 3),
+                                           (['R', 'L', 'R'], 2)]:
+        scrambled = apply_moves(solved_state(), scramble_moves)
+        lengths = []
+        for canonical in (True, False):
+            solution = IDAStar(ZeroHeuristic(), canonical=canonical).solve(scrambled, verbose=False)
+            assert verify_solution(scrambled, solution), f"Invalid solution for {scramble_moves}"
+            lengths.append(len(solution))
+        assert lengths == [optimal_length, optimal_length], f"Lengths {lengths} for {scramble_moves}"
+    print("✓ Search pruning test passed")
+
+
+def test_move_apply_paths():
+    """Test that every move application path gives the same state as Move.apply()."""
+    from moves import expand_all
+    
+    state = apply_moves(solved_state(), "R U2 F' L D B2 R' F U' D2 L' B".split())
+    children = expand_all(state)
+    out = CubeState()
+    for k, move in enumerate(ALL_MOVES):
+        expected = move.apply(state).to_bytes()
+        move.apply_into(state, out)
+        assert out.to_bytes() == expected, f"apply_into mismatch for {move.name}"
+        in_place = state.copy()
+        move.apply_in_place(in_place)
+        assert in_place.to_bytes() == expected, f"apply_in_place mismatch for {move.name}"
+        assert bytes(move.apply_fast(state._data.tolist())) == expected, f"apply_fast mismatch for {move.name}"
+        assert children[k].tobytes() == expected, f"expand_all mismatch for {move.name}"
+    print("✓ Move application paths test passed")
+
+
 def test_heuristic_basic():
     """Test that heuristics can be computed."""
     from heuristics import Heuristic
@@ -81,6 +222,11 @@ if __name__ == '__main__':
     test_move_application()
     test_move_sequence()
     test_scramble_solve()
+    test_converter_roundtrip()
+    test_pdb_packed_storage()
+    test_h_batch_matches_h()
+    test_search_pruning_keeps_optimal_length()
+    test_move_apply_paths()
     test_heuristic_basic()
     
     print()
@@ -4,7 +4,7 @@ Utility functions for cube manipulation.
 
 import random
 from cube_state import CubeState
-from moves import MOVE_TABLE, MOVE_NAMES
+from moves import MOVE_TABLE, MOVE_NAMES, Move
 
 
 def apply_moves(state: CubeState, move_names: list) -> CubeState:
@@ -27,6 +27,25 @@ def apply_moves(state: CubeState, move_names: list) -> CubeState:
     return current_state
 
 
+def compose_moves(move_names: list) -> Move:
+    """
+    Compose a sequence of moves into a single equivalent Move.
+    
+    Args:
+        move_names: non-empty list of move names (e.g., ['U', "R'", 'F2'])
+    
+    Returns:
+        Move whose apply() has the same effect as applying every move in order
+    """
+    for move_name in move_names:
+        if move_name not in MOVE_TABLE:
+            raise ValueError(f"Unknown move: {move_name}")
+    composed = MOVE_TABLE[move_names[0]]
+    for move_name in move_names[1:]:
+        composed = composed.compose(MOVE_TABLE[move_name])
+    return composed
+
+
 def scramble(state: CubeState, num_moves: int = 25, seed: int = None) -> tuple:
     """
     Scramble the cube by applying random moves.